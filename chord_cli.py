@@ -6,29 +6,98 @@ CHORD CLI - Command-line interface for CHORD orchestration language
 import os
 import sys
 import json
-import asyncio
+import math
 import argparse
-import readline
+import hashlib
+import mmap
+import tempfile
+from collections import deque
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import logging
 
-# Import CHORD modules
+def _has_nonfinite(obj: Any) -> bool:
+    """Whether obj holds an inf or NaN float anywhere in its containers"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+# Use orjson for bulk JSON output when it is installed
 try:
-    from chord_compiler import compile_chord, compile_file
-    from chord_runtime import Runtime, execute_ir
+    import orjson
+    
+    def _fast_dumps(obj: Any) -> str:
+        try:
+            data = orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # Non-str keys, integers beyond 64 bits: leave these to the stdlib
+            return json.dumps(obj, indent=2, default=str)
+        # orjson writes non-finite floats as null; json keeps them as Infinity
+        if b'null' in data and _has_nonfinite(obj):
+            return json.dumps(obj, indent=2, default=str)
+        return data.decode('utf-8')
+    
+    def _fast_dumps_compact(obj: Any) -> str:
+        try:
+            data = orjson.dumps(obj, default=str)
+        except TypeError:
+            return json.dumps(obj, default=str, separators=(',', ':'))
+        if b'null' in data and _has_nonfinite(obj):
+            return json.dumps(obj, default=str, separators=(',', ':'))
+        return data.decode('utf-8')
 except ImportError:
-    print("Error: chord_compiler.py and chord_runtime.py must be in the same directory or installed")
-    sys.exit(1)
+    def _fast_dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2, default=str)
+    
+    def _fast_dumps_compact(obj: Any) -> str:
+        return json.dumps(obj, default=str, separators=(',', ':'))
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Logging is configured by the commands that run the runtime, so trivial
+# commands skip handler/formatter setup entirely
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_log_configured = False
+
+
+def _configure_logging():
+    """Configure logging once; level comes from $CHORD_LOG (default WARNING)"""
+    global _log_configured
+    if not _log_configured:
+        level = os.environ.get('CHORD_LOG', 'WARNING').upper()
+        # getLevelName maps known level names to their number
+        valid = isinstance(logging.getLevelName(level), int)
+        logging.basicConfig(level=level if valid else 'WARNING', format=LOG_FORMAT)
+        _log_configured = True
+        if not valid:
+            logger.warning(f"Unknown CHORD_LOG level {level!r}, using WARNING")
+
+def _cache_home() -> Path:
+    """$XDG_CACHE_HOME, ignoring empty or relative values as the XDG spec requires"""
+    cache_home = os.environ.get('XDG_CACHE_HOME', '')
+    if cache_home and os.path.isabs(cache_home):
+        return Path(cache_home)
+    return Path.home() / '.cache'
+
+
+# On-disk cache of compiled IR, keyed by compiler and source hash; only the
+# most recently used entries are kept
+IR_CACHE_DIR = _cache_home() / 'chord' / 'ir'
+IR_CACHE_MAX_ENTRIES = 256
+
+# Source files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 1024 * 1024
+
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -43,6 +112,167 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Module-level bindings for hot output paths (avoids Colors.* attribute lookups)
+_CYAN, _END, _GREEN, _BOLD, _FAIL, _WARN = (
+    Colors.CYAN, Colors.END, Colors.GREEN, Colors.BOLD, Colors.FAIL, Colors.WARNING
+)
+_CHECK = f"{_GREEN}✓ "
+_ERR = f"{_FAIL}Error: "
+
+
+# Erase display and move the cursor home
+CLEAR_SCREEN = '\033[2J\033[H'
+
+
+def _enable_windows_vt():
+    """Turn on ANSI escape handling for the Windows console"""
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+    except (AttributeError, OSError):
+        pass
+
+
+def _clear_screen():
+    """Clear the terminal without spawning a shell"""
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
+
+
+if os.name == 'nt':
+    _enable_windows_vt()
+
+
+def _missing_chord_modules():
+    """Abort when the compiler/runtime modules cannot be imported"""
+    print("Error: chord_compiler.py and chord_runtime.py must be in the same directory or installed")
+    sys.exit(1)
+
+
+# CHORD modules are imported on first use so that trivial commands
+# (version, help, init) don't pay for loading the compiler and runtime.
+
+def _load_or_compile(path: Path) -> Dict[str, Any]:
+    """Compile a CHORD file, reusing cached IR when the source is unchanged"""
+    try:
+        import chord_compiler
+        from chord_compiler import compile_chord
+    except ImportError:
+        _missing_chord_modules()
+    
+    # Large files are mapped rather than read so a cache hit only pages
+    # the source through the hasher and never decodes it
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+    
+    try:
+        # Key on the compiler's own source too, so IR cached by an older
+        # compiler is never served after an upgrade
+        hasher = hashlib.sha256(_compiler_fingerprint(chord_compiler))
+        hasher.update(data)
+        cache_path = IR_CACHE_DIR / f"{hasher.hexdigest()}.json"
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                ir = json.load(f)
+        except (OSError, ValueError):
+            pass
+        else:
+            # Refresh the mtime so pruning drops the least recently used
+            # entries; a read-only cache still serves the hit
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return ir
+        
+        # Same newline handling as reading the file in text mode
+        source = str(data, 'utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    
+    ir = compile_chord(source)
+    
+    # Write atomically so concurrent runs never see a partial entry
+    try:
+        IR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=IR_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(ir, f, separators=(',', ':'))
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        _prune_ir_cache()
+    except OSError as e:
+        logger.debug(f"Could not write IR cache {cache_path}: {e}")
+    
+    return ir
+
+
+def _compiler_fingerprint(compiler: Any) -> bytes:
+    """Digest of the compiler source, identifying the IR it produces"""
+    try:
+        with open(compiler.__file__, 'rb') as f:
+            return hashlib.sha256(f.read()).digest()
+    except (OSError, TypeError):
+        return f"{compiler.__version__}\0".encode('utf-8')
+
+
+def _prune_ir_cache():
+    """Delete all but the IR_CACHE_MAX_ENTRIES most recently used cache entries"""
+    entries = []
+    with os.scandir(IR_CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith('.json'):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    pass
+    if len(entries) <= IR_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(reverse=True)
+    for _, stale_path in entries[IR_CACHE_MAX_ENTRIES:]:
+        try:
+            os.unlink(stale_path)
+        except OSError:
+            pass
+
+
+# Preview lengths for view output in the REPL
+CONTEXT_PREVIEW = 100
+PROMPT_PREVIEW = 500
+
+
+def _truncated(value: Any, limit: int) -> str:
+    """Preview a value without stringifying more of it than needed"""
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, (dict, list)) and len(value) > 10:
+        return f"<{type(value).__name__} len={len(value)}>"
+    else:
+        text = str(value)
+    if len(text) > limit:
+        return text[:limit] + "..."
+    return text
+
+
+QUIT_COMMANDS = frozenset(('quit', 'exit', 'q'))
+
+# REPL history, shared with readline for up-arrow recall across sessions
+HISTORY_SIZE = 1000
+HISTORY_FILE = Path.home() / '.chord_history'
+
+
 class CHORDRepl:
     """Interactive REPL for CHORD"""
     
@@ -51,7 +281,22 @@ class CHORDRepl:
         self.ir = None
         self.runtime = None
         self.signals = {}
-        self.history = []
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.loop = None
+        
+        # command -> (handler, minimum argument count, usage message)
+        self._dispatch = {
+            'help': (self._cmd_help, 0, None),
+            'load': (self._cmd_load, 1, 'Usage: load <file.chord>'),
+            'signal': (self._cmd_signal, 2, 'Usage: signal <name> <value>'),
+            'signals': (self._cmd_signals, 0, None),
+            'nodes': (self._cmd_nodes, 0, None),
+            'show': (self._cmd_show, 1, 'Usage: show <node_id>'),
+            'view': (self._cmd_view, 1, 'Usage: view <view_id>'),
+            'task': (self._cmd_task, 1, 'Usage: task <task_id>'),
+            'ir': (self._cmd_ir, 0, None),
+            'clear': (self._cmd_clear, 0, None),
+        }
         
         if initial_file:
             self.load_file(initial_file)
@@ -59,12 +304,14 @@ class CHORDRepl:
     def load_file(self, filepath: Path):
         """Load a CHORD file"""
         try:
-            with open(filepath, 'r') as f:
-                source = f.read()
-            
-            self.ir = compile_chord(source)
+            from chord_runtime import Runtime
+        except ImportError:
+            _missing_chord_modules()
+        
+        try:
+            self.ir = _load_or_compile(filepath)
             self.runtime = Runtime(self.ir)
-            print(f"{Colors.GREEN}✓ Loaded {filepath}{Colors.END}")
+            print(f"{_CHECK}Loaded {filepath}{_END}")
             print(f"  Nodes: {len(self.ir.get('nodes', {}))}")
             print(f"  Views: {len(self.ir.get('views', []))}")
             print(f"  Flows: {len(self.ir.get('flows', []))}")
@@ -76,7 +323,7 @@ class CHORDRepl:
         self.signals[name] = value
         if self.runtime:
             self.runtime.set_signal(name, value)
-        print(f"{Colors.GREEN}✓ Set signal {name} = {value}{Colors.END}")
+        print(f"{_CHECK}Set signal {name} = {value}{_END}")
     
     def list_nodes(self, node_type: Optional[str] = None):
         """List nodes in the graph"""
@@ -84,19 +331,18 @@ class CHORDRepl:
             print(f"{Colors.WARNING}No CHORD file loaded{Colors.END}")
             return
         
-        nodes = self.ir.get('nodes', {})
-        
-        if node_type:
-            filtered = {k: v for k, v in nodes.items() if v['type'] == node_type}
-            nodes = filtered
-        
-        if not nodes:
-            print(f"{Colors.WARNING}No nodes found{Colors.END}")
-            return
+        # Filter and print in one pass; the header is printed on first match
+        found = False
+        for node_id, node in self.ir.get('nodes', {}).items():
+            if node_type and node['type'] != node_type:
+                continue
+            if not found:
+                print(f"\n{_BOLD}Nodes:{_END}")
+                found = True
+            print(f"  {_CYAN}{node['type']}{_END} {node_id}")
         
-        print(f"\n{Colors.BOLD}Nodes:{Colors.END}")
-        for node_id, node in nodes.items():
-            print(f"  {Colors.CYAN}{node['type']}{Colors.END} {node_id}")
+        if not found:
+            print(f"{_WARN}No nodes found{_END}")
     
     def show_node(self, node_id: str):
         """Show details of a specific node"""
@@ -127,12 +373,12 @@ class CHORDRepl:
             print(f"\n{Colors.BOLD}View: {view_id}{Colors.END}")
             print(f"\n{Colors.CYAN}Resolved Context:{Colors.END}")
             for key, value in result.get('resolved_context', {}).items():
-                print(f"  {key}: {str(value)[:100]}...")
+                print(f"  {key}: {_truncated(value, CONTEXT_PREVIEW)}")
             
             print(f"\n{Colors.CYAN}Prompt:{Colors.END}")
             for section, content in result.get('prompt', {}).items():
                 print(f"\n  {Colors.BOLD}{section}:{Colors.END}")
-                print(f"  {content[:500]}...")
+                print(f"  {_truncated(content, PROMPT_PREVIEW)}")
             
         except Exception as e:
             print(f"{Colors.FAIL}Error executing view: {e}{Colors.END}")
@@ -146,12 +392,28 @@ class CHORDRepl:
         try:
             result = await self.runtime.execute_task(task_id)
             print(f"\n{Colors.BOLD}Task: {task_id}{Colors.END}")
-            print(json.dumps(result, indent=2, default=str))
+            print(_fast_dumps(result))
         except Exception as e:
             print(f"{Colors.FAIL}Error executing task: {e}{Colors.END}")
     
     def run(self):
         """Run the REPL"""
+        import asyncio
+        import readline  # enables line editing and history for input()
+        
+        readline.set_history_length(HISTORY_SIZE)
+        try:
+            readline.read_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+        
+        # One event loop for the whole session instead of one per command
+        try:
+            import uvloop
+            self.loop = uvloop.new_event_loop()
+        except ImportError:
+            self.loop = asyncio.new_event_loop()
+        
         print(f"\n{Colors.BOLD}CHORD Interactive Shell{Colors.END}")
         print("Type 'help' for commands or 'quit' to exit\n")
         
@@ -163,72 +425,75 @@ class CHORDRepl:
                     continue
                 
                 self.history.append(command)
-                parts = command.split()
+                # At most three fields: command, first argument, remainder
+                parts = command.split(None, 2)
                 cmd = parts[0].lower()
                 
-                if cmd in ['quit', 'exit', 'q']:
+                if cmd in QUIT_COMMANDS:
                     print("Goodbye!")
                     break
                 
-                elif cmd == 'help':
-                    self.show_help()
-                
-                elif cmd == 'load':
-                    if len(parts) < 2:
-                        print(f"{Colors.WARNING}Usage: load <file.chord>{Colors.END}")
-                    else:
-                        self.load_file(Path(parts[1]))
-                
-                elif cmd == 'signal':
-                    if len(parts) < 3:
-                        print(f"{Colors.WARNING}Usage: signal <name> <value>{Colors.END}")
-                    else:
-                        self.set_signal(parts[1], ' '.join(parts[2:]))
-                
-                elif cmd == 'signals':
-                    print(f"\n{Colors.BOLD}Signals:{Colors.END}")
-                    for name, value in self.signals.items():
-                        print(f"  {name} = {value}")
-                
-                elif cmd == 'nodes':
-                    node_type = parts[1] if len(parts) > 1 else None
-                    self.list_nodes(node_type)
-                
-                elif cmd == 'show':
-                    if len(parts) < 2:
-                        print(f"{Colors.WARNING}Usage: show <node_id>{Colors.END}")
-                    else:
-                        self.show_node(parts[1])
-                
-                elif cmd == 'view':
-                    if len(parts) < 2:
-                        print(f"{Colors.WARNING}Usage: view <view_id>{Colors.END}")
-                    else:
-                        asyncio.run(self.execute_view(parts[1]))
-                
-                elif cmd == 'task':
-                    if len(parts) < 2:
-                        print(f"{Colors.WARNING}Usage: task <task_id>{Colors.END}")
-                    else:
-                        asyncio.run(self.execute_task(parts[1]))
-                
-                elif cmd == 'ir':
-                    if self.ir:
-                        print(json.dumps(self.ir, indent=2))
-                    else:
-                        print(f"{Colors.WARNING}No CHORD file loaded{Colors.END}")
-                
-                elif cmd == 'clear':
-                    os.system('clear' if os.name == 'posix' else 'cls')
-                
-                else:
+                entry = self._dispatch.get(cmd)
+                if entry is None:
                     print(f"{Colors.WARNING}Unknown command: {cmd}{Colors.END}")
                     print("Type 'help' for available commands")
+                    continue
+                
+                handler, min_args, usage = entry
+                if len(parts) - 1 < min_args:
+                    print(f"{Colors.WARNING}{usage}{Colors.END}")
+                else:
+                    handler(parts)
             
             except KeyboardInterrupt:
                 print("\nUse 'quit' to exit")
             except Exception as e:
-                print(f"{Colors.FAIL}Error: {e}{Colors.END}")
+                print(f"{_ERR}{e}{_END}")
+        
+        self.loop.close()
+        try:
+            readline.write_history_file(HISTORY_FILE)
+        except OSError as e:
+            logger.debug(f"Could not save REPL history: {e}")
+    
+    # Command handlers; each receives the input line split into at most
+    # [command, first argument, remainder]
+    
+    def _cmd_help(self, parts: List[str]):
+        self.show_help()
+    
+    def _cmd_load(self, parts: List[str]):
+        self.load_file(Path(parts[1]))
+    
+    def _cmd_signal(self, parts: List[str]):
+        self.set_signal(parts[1], parts[2])
+    
+    def _cmd_signals(self, parts: List[str]):
+        print(f"\n{Colors.BOLD}Signals:{Colors.END}")
+        for name, value in self.signals.items():
+            print(f"  {name} = {value}")
+    
+    def _cmd_nodes(self, parts: List[str]):
+        self.list_nodes(parts[1] if len(parts) > 1 else None)
+    
+    def _cmd_show(self, parts: List[str]):
+        self.show_node(parts[1])
+    
+    def _cmd_view(self, parts: List[str]):
+        self.loop.run_until_complete(self.execute_view(parts[1]))
+    
+    def _cmd_task(self, parts: List[str]):
+        self.loop.run_until_complete(self.execute_task(parts[1]))
+    
+    def _cmd_ir(self, parts: List[str]):
+        if self.ir:
+            json.dump(self.ir, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        else:
+            print(f"{Colors.WARNING}No CHORD file loaded{Colors.END}")
+    
+    def _cmd_clear(self, parts: List[str]):
+        _clear_screen()
     
     def show_help(self):
         """Show help message"""
@@ -252,9 +517,16 @@ class CHORDRepl:
 
 def cmd_run(args):
     """Run a CHORD file"""
+    import asyncio
+    _configure_logging()
+    try:
+        from chord_runtime import execute_ir
+    except ImportError:
+        _missing_chord_modules()
+    
     try:
         # Compile
-        ir = compile_file(Path(args.file))
+        ir = _load_or_compile(Path(args.file))
         
         # Parse signals
         signals = {}
@@ -269,9 +541,12 @@ def cmd_run(args):
         
         # Output
         if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(result, f, indent=2, default=str)
-            print(f"{Colors.GREEN}✓ Output written to {args.output}{Colors.END}")
+            with open(args.output, 'w', encoding='utf-8') as f:
+                if args.compact:
+                    f.write(_fast_dumps_compact(result))
+                else:
+                    json.dump(result, f, indent=2, default=str)
+            print(f"{_CHECK}Output written to {args.output}{_END}")
         else:
             # Pretty print prompt if it's a view result
             if 'prompt' in result:
@@ -280,27 +555,32 @@ def cmd_run(args):
                     print(f"\n{Colors.CYAN}{section.upper()}:{Colors.END}")
                     print(content)
             else:
-                print(json.dumps(result, indent=2, default=str))
+                print(_fast_dumps(result))
     
     except Exception as e:
-        print(f"{Colors.FAIL}Error: {e}{Colors.END}")
+        print(f"{_ERR}{e}{_END}")
         sys.exit(1)
 
 
 def cmd_compile(args):
     """Compile a CHORD file to IR"""
+    try:
+        from chord_compiler import compile_file
+    except ImportError:
+        _missing_chord_modules()
+    
     try:
         ir = compile_file(Path(args.file))
         
         output_path = args.output or args.file.replace('.chord', '.chordi')
         
-        with open(output_path, 'w') as f:
+        with open(output_path, 'w', encoding='utf-8') as f:
             if args.pretty:
                 json.dump(ir, f, indent=2)
             else:
-                json.dump(ir, f)
+                f.write(_fast_dumps_compact(ir))
         
-        print(f"{Colors.GREEN}✓ Compiled to {output_path}{Colors.END}")
+        print(f"{_CHECK}Compiled to {output_path}{_END}")
         
         # Show stats
         print(f"  Nodes: {len(ir.get('nodes', {}))}")
@@ -312,31 +592,40 @@ def cmd_compile(args):
         sys.exit(1)
 
 
+# View fields that reference other nodes
+VIEW_REF_KEYS = ('task', 'role', 'model', 'policy')
+
+
 def cmd_validate(args):
     """Validate a CHORD file"""
     try:
-        ir = compile_file(Path(args.file))
-        print(f"{Colors.GREEN}✓ {args.file} is valid CHORD{Colors.END}")
+        ir = _load_or_compile(Path(args.file))
+        print(f"{_CHECK}{args.file} is valid CHORD{_END}")
         
         # Show warnings if any
         warnings = []
         
         # Check for unreferenced nodes
-        referenced = set()
-        for view in ir.get('views', []):
-            for key in ['task', 'role', 'model', 'policy']:
-                ref = view.get(key, '')
-                if ref.startswith('@'):
-                    referenced.add(ref[1:])
-        
-        unreferenced = set(ir.get('nodes', {}).keys()) - referenced
-        if unreferenced:
-            warnings.append(f"Unreferenced nodes: {', '.join(unreferenced)}")
+        referenced = {
+            ref[1:]
+            for view in ir.get('views', [])
+            for ref in map(view.get, VIEW_REF_KEYS)
+            if ref and ref.startswith('@')
+        }
         
-        # Check for missing required fields
+        # Single pass over nodes for both unreferenced and missing-field checks
+        unreferenced = []
+        missing_uri = []
         for node_id, node in ir.get('nodes', {}).items():
+            if node_id not in referenced:
+                unreferenced.append(node_id)
             if node['type'] == 'ctx' and 'uri' not in node.get('properties', {}):
-                warnings.append(f"Context {node_id} missing 'uri' property")
+                missing_uri.append(node_id)
+        
+        if unreferenced:
+            warnings.append(f"Unreferenced nodes: {', '.join(unreferenced)}")
+        for node_id in missing_uri:
+            warnings.append(f"Context {node_id} missing 'uri' property")
         
         if warnings:
             print(f"\n{Colors.WARNING}Warnings:{Colors.END}")
@@ -350,34 +639,14 @@ def cmd_validate(args):
 
 def cmd_repl(args):
     """Start interactive REPL"""
+    _configure_logging()
     initial_file = Path(args.file) if args.file else None
     repl = CHORDRepl(initial_file)
     repl.run()
 
 
-def cmd_init(args):
-    """Initialize a new CHORD project"""
-    project_name = args.project
-    project_path = Path(project_name)
-    
-    if project_path.exists():
-        print(f"{Colors.WARNING}Directory {project_name} already exists{Colors.END}")
-        sys.exit(1)
-    
-    try:
-        # Create project structure
-        project_path.mkdir()
-        (project_path / "contexts").mkdir()
-        (project_path / "capabilities").mkdir()
-        (project_path / "orchestration").mkdir()
-        (project_path / "orchestration" / "flows").mkdir()
-        (project_path / "orchestration" / "views").mkdir()
-        (project_path / "policies").mkdir()
-        (project_path / "models").mkdir()
-        (project_path / "tests").mkdir()
-        
-        # Create main.chord
-        main_content = """# Main CHORD file for {project}
+# Project scaffold written by `chord init`; templates take the project name
+MAIN_CHORD_TEMPLATE = """# Main CHORD file for %s
 
 # Import common definitions
 # import "contexts/main.chord"
@@ -385,40 +654,36 @@ def cmd_init(args):
 # import "models/models.chord"
 
 # Define a simple example
-def ctx readme {{
+def ctx readme {
   type: file
   uri: "fs://README.md"
-}}
+}
 
-def role assistant {{
+def role assistant {
   persona: "helpful AI assistant"
   principles: ["be clear", "be concise"]
-}}
+}
 
-def task summarize {{
+def task summarize {
   objective: "Summarize the README"
-}}
+}
 
-def view main {{
+def view main {
   task: @task.summarize
   role: @role.assistant
   
   selectors: [
-    {{ from: @ctx.readme, op: "head", lines: 50 }}
+    { from: @ctx.readme, op: "head", lines: 50 }
   ]
   
-  prompt: {{
-    system: "You are {{{{role.persona}}}}."
+  prompt: {
+    system: "You are {{role.persona}}."
     user: "Please summarize this README."
-  }}
-}}
-""".format(project=project_name)
-        
-        with open(project_path / "main.chord", 'w') as f:
-            f.write(main_content)
-        
-        # Create README
-        readme_content = f"""# {project_name}
+  }
+}
+"""
+
+README_TEMPLATE = """# %s
 
 A CHORD orchestration project.
 
@@ -445,21 +710,52 @@ chord repl main.chord
 chord compile main.chord
 ```
 """
-        
-        with open(project_path / "README.md", 'w') as f:
-            f.write(readme_content)
-        
-        # Create .gitignore
-        gitignore_content = """*.chordi
+
+GITIGNORE_CONTENT = """*.chordi
 *.cache
 __pycache__/
 .env
 """
+
+# Project scaffold directories created by `chord init`
+PROJECT_DIRS = (
+    "contexts",
+    "capabilities",
+    "orchestration/flows",
+    "orchestration/views",
+    "policies",
+    "models",
+    "tests",
+)
+
+
+def cmd_init(args):
+    """Initialize a new CHORD project"""
+    project_name = args.project
+    project_path = Path(project_name)
+    
+    if project_path.exists():
+        print(f"{Colors.WARNING}Directory {project_name} already exists{Colors.END}")
+        sys.exit(1)
+    
+    try:
+        # Create project structure
+        # (leaf directories only; parents are created implicitly)
+        for subdir in PROJECT_DIRS:
+            (project_path / subdir).mkdir(parents=True)
         
-        with open(project_path / ".gitignore", 'w') as f:
-            f.write(gitignore_content)
+        main_content = MAIN_CHORD_TEMPLATE % project_name
+        readme_content = README_TEMPLATE % project_name
         
-        print(f"{Colors.GREEN}✓ Created CHORD project: {project_name}{Colors.END}")
+        # Write all scaffold files in one batch
+        for filename, content in (
+            ("main.chord", main_content),
+            ("README.md", readme_content),
+            (".gitignore", GITIGNORE_CONTENT),
+        ):
+            (project_path / filename).write_text(content)
+        
+        print(f"{_CHECK}Created CHORD project: {project_name}{_END}")
         print(f"\nNext steps:")
         print(f"  cd {project_name}")
         print(f"  chord run main.chord")
@@ -469,55 +765,81 @@ __pycache__/
         sys.exit(1)
 
 
-def main():
-    """Main CLI entry point"""
-    parser = argparse.ArgumentParser(
-        description="CHORD - Contextual Hierarchy & Orchestration for Requests & Directives",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  chord run example.chord                     # Run a CHORD file
-  chord compile example.chord -o example.ir   # Compile to IR
-  chord validate example.chord                # Validate syntax
-  chord repl                                   # Start interactive REPL
-  chord init my-project                       # Create new project
-"""
-    )
-    
-    subparsers = parser.add_subparsers(dest='command', help='Commands')
-    
-    # Run command
+def _add_run_parser(subparsers):
     run_parser = subparsers.add_parser('run', help='Execute a CHORD file')
     run_parser.add_argument('file', help='CHORD file to run')
     run_parser.add_argument('--signal', '-s', action='append', help='Set signal (name=value)')
     run_parser.add_argument('--output', '-o', help='Output file path')
+    run_parser.add_argument('--compact', action='store_true', help='Write compact JSON to the output file')
     run_parser.set_defaults(func=cmd_run)
-    
-    # Compile command
+
+
+def _add_compile_parser(subparsers):
     compile_parser = subparsers.add_parser('compile', help='Compile to IR')
     compile_parser.add_argument('file', help='CHORD file to compile')
     compile_parser.add_argument('--output', '-o', help='Output file path')
     compile_parser.add_argument('--pretty', action='store_true', help='Pretty print JSON')
     compile_parser.set_defaults(func=cmd_compile)
-    
-    # Validate command
+
+
+def _add_validate_parser(subparsers):
     validate_parser = subparsers.add_parser('validate', help='Validate CHORD file')
     validate_parser.add_argument('file', help='CHORD file to validate')
     validate_parser.set_defaults(func=cmd_validate)
-    
-    # REPL command
+
+
+def _add_repl_parser(subparsers):
     repl_parser = subparsers.add_parser('repl', help='Start interactive REPL')
     repl_parser.add_argument('file', nargs='?', help='Initial CHORD file to load')
     repl_parser.set_defaults(func=cmd_repl)
-    
-    # Init command
+
+
+def _add_init_parser(subparsers):
     init_parser = subparsers.add_parser('init', help='Initialize new project')
     init_parser.add_argument('project', help='Project name')
     init_parser.set_defaults(func=cmd_init)
-    
-    # Version command
+
+
+def _add_version_parser(subparsers):
     version_parser = subparsers.add_parser('version', help='Show version')
     version_parser.set_defaults(func=lambda args: print("CHORD v1.0.0"))
+
+
+# Subcommand name -> function registering its parser (in help order)
+SUBCOMMAND_BUILDERS = {
+    'run': _add_run_parser,
+    'compile': _add_compile_parser,
+    'validate': _add_validate_parser,
+    'repl': _add_repl_parser,
+    'init': _add_init_parser,
+    'version': _add_version_parser,
+}
+
+
+def main():
+    """Main CLI entry point"""
+    parser = argparse.ArgumentParser(
+        description="CHORD - Contextual Hierarchy & Orchestration for Requests & Directives",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  chord run example.chord                     # Run a CHORD file
+  chord compile example.chord -o example.ir   # Compile to IR
+  chord validate example.chord                # Validate syntax
+  chord repl                                   # Start interactive REPL
+  chord init my-project                       # Create new project
+"""
+    )
+    
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+    
+    # Only build the subparser being invoked; help and unknown commands get all of them
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in SUBCOMMAND_BUILDERS:
+        SUBCOMMAND_BUILDERS[command](subparsers)
+    else:
+        for add_subparser in SUBCOMMAND_BUILDERS.values():
+            add_subparser(subparsers)
     
     args = parser.parse_args()
     
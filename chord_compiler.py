@@ -3,14 +3,54 @@
 CHORD Compiler - Parses .chord files and generates IR (Intermediate Representation)
 """
 
+import os
 import re
+import sys
 import json
+import math
+import mmap
 import hashlib
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+def _has_nonfinite(ir: Any) -> bool:
+    """Whether IR holds a float literal that overflowed to infinity (or NaN)"""
+    stack = [ir]
+    while stack:
+        value = stack.pop()
+        if type(value) is float:
+            if not math.isfinite(value):
+                return True
+        elif type(value) is dict:
+            stack.extend(value.values())
+        elif type(value) is list:
+            stack.extend(value)
+    return False
+
+
+# Serialize IR with orjson when it is installed; both variants return UTF-8 bytes
+try:
+    import orjson
+    
+    def _dumps(obj: Any, pretty: bool = False) -> bytes:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            # Integers beyond 64 bits: leave these to the stdlib
+            return json.dumps(obj, indent=2 if pretty else None, check_circular=False).encode('utf-8')
+        # orjson writes non-finite floats as null; json keeps them as Infinity
+        if b'null' in data and _has_nonfinite(obj):
+            return json.dumps(obj, indent=2 if pretty else None, check_circular=False).encode('utf-8')
+        return data
+except ImportError:
+    # IR never contains cycles, so skip the encoder's per-container id tracking
+    def _dumps(obj: Any, pretty: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if pretty else None, check_circular=False).encode('utf-8')
+
+__version__ = "1.0.0"
+
 
 class NodeType(Enum):
     CTX = "ctx"
@@ -28,6 +68,9 @@ class NodeType(Enum):
     CACHE = "cache"
 
 
+_NODE_TYPE_BY_VALUE = {nt.value: nt for nt in NodeType}
+
+
 class TokenType(Enum):
     DEF = "def"
     IDENTIFIER = "identifier"
@@ -48,15 +91,40 @@ class TokenType(Enum):
     EOF = "eof"
 
 
-@dataclass
+# Integer token tags, in TokenType declaration order. The lexer emits tokens
+# as plain (tag, value, line, column) tuples; _TOKEN_TYPES maps a tag back
+# to its TokenType for error messages and the Token wrapper.
+_TOKEN_TYPES = tuple(TokenType)
+(_TAG_DEF, _TAG_IDENTIFIER, _TAG_LBRACE, _TAG_RBRACE, _TAG_LBRACKET,
+ _TAG_RBRACKET, _TAG_COLON, _TAG_COMMA, _TAG_STRING, _TAG_NUMBER,
+ _TAG_BOOLEAN, _TAG_NULL, _TAG_REFERENCE, _TAG_COMMENT, _TAG_PIPE,
+ _TAG_NEWLINE, _TAG_EOF) = range(len(_TOKEN_TYPES))
+
+RawToken = Tuple[int, Any, int, int]
+
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain dataclasses
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Token:
     type: TokenType
     value: Any
     line: int
     column: int
+    
+    @classmethod
+    def from_raw(cls, raw: RawToken) -> "Token":
+        """Wrap a (tag, value, line, column) tuple from Lexer.tokenize
+        
+        Public API: tokenize returns raw tuples, and callers that want the
+        dataclass convert them with this.
+        """
+        tag, value, line, column = raw
+        return cls(_TOKEN_TYPES[tag], value, line, column)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Node:
     type: NodeType
     id: str
@@ -65,13 +133,72 @@ class Node:
     line: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Graph:
     nodes: Dict[str, Node] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
     imports: List[str] = field(default_factory=list)
 
 
+# Master token pattern. Alternatives are tried in order; SLOW marks the
+# constructs handled by the character-level readers (multi-line strings,
+# dynamic @{...} references and unterminated strings). String bodies use the
+# unrolled [^q\\]*(?:\\.[^q\\]*)* form so runs of plain characters are
+# consumed without trying an alternation per character.
+_TOKEN_RE = re.compile(r"""
+    (?P<WS>[ \t\r]+)
+  | (?P<NEWLINE>\n)
+  | (?P<COMMENT>\#\[.*?\]\#|\#\[.*|\#[^\n]*)
+  | (?P<STRING>"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*')
+  | (?P<NUMBER>\d+(?:\.\d*)?)
+  | (?P<REFERENCE>@(?!\{)[\w.\[\]]*)
+  | (?P<WORD>[\w-]+)
+  | (?P<PUNCT>[{}\[\]:,])
+  | (?P<SLOW>["'|@])
+""", re.VERBOSE | re.DOTALL)
+
+# Quoted string literal; the body is group 1 ("...") or group 2 ('...')
+_STRING_RE = re.compile(r""""([^"\\]*(?:\\.[^"\\]*)*)"|'([^'\\]*(?:\\.[^'\\]*)*)'""", re.DOTALL)
+
+# Backslash escapes; any other escaped character stands for itself
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+_ESCAPES = {'n': '\n', 't': '\t'}
+
+
+def _replace_escape(m: "re.Match[str]") -> str:
+    char = m.group(1)
+    return _ESCAPES.get(char, char)
+
+
+def _unescape(body: str) -> str:
+    """Decode backslash escapes in a string literal body"""
+    if '\\' not in body:
+        return body
+    return _ESCAPE_RE.sub(_replace_escape, body)
+
+
+# Reference bodies after '@': a dotted path, or a braced dynamic reference
+# (matched here up to one level of inner braces)
+_REF_BODY_RE = re.compile(r'[\w.\[\]]*')
+_DYNAMIC_REF_RE = re.compile(r'\{(?:[^{}]|\{[^{}]*\})*\}')
+
+_KEYWORDS = {
+    "def": (_TAG_DEF, "def"),
+    "true": (_TAG_BOOLEAN, True),
+    "false": (_TAG_BOOLEAN, False),
+    "null": (_TAG_NULL, None),
+}
+
+_PUNCTUATION = {
+    '{': _TAG_LBRACE,
+    '}': _TAG_RBRACE,
+    '[': _TAG_LBRACKET,
+    ']': _TAG_RBRACKET,
+    ':': _TAG_COLON,
+    ',': _TAG_COMMA,
+}
+
+
 class Lexer:
     """Tokenizes CHORD source code"""
     
@@ -80,7 +207,7 @@ class Lexer:
         self.pos = 0
         self.line = 1
         self.column = 1
-        self.tokens: List[Token] = []
+        self.tokens: List[RawToken] = []
     
     def current_char(self) -> Optional[str]:
         if self.pos >= len(self.source):
@@ -103,31 +230,27 @@ class Lexer:
             self.column += 1
         return char
     
-    def skip_whitespace(self):
-        while self.current_char() and self.current_char() in ' \t\r':
-            self.advance()
-    
-    def skip_comment(self):
-        if self.current_char() == '#':
-            # Check for multi-line comment
-            if self.peek_char() == '[':
-                self.advance()  # Skip #
-                self.advance()  # Skip [
-                while True:
-                    if self.current_char() == ']' and self.peek_char() == '#':
-                        self.advance()  # Skip ]
-                        self.advance()  # Skip #
-                        break
-                    if not self.current_char():
-                        break
-                    self.advance()
-            else:
-                # Single line comment
-                while self.current_char() and self.current_char() != '\n':
-                    self.advance()
+    def _advance_to(self, end: int):
+        """Move to `end`, updating line/column for the skipped span"""
+        src = self.source
+        newlines = src.count('\n', self.pos, end)
+        if newlines:
+            self.line += newlines
+            self.column = end - src.rindex('\n', self.pos, end)
+        else:
+            self.column += end - self.pos
+        self.pos = end
     
     def read_string(self) -> str:
-        quote = self.advance()  # Skip opening quote
+        m = _STRING_RE.match(self.source, self.pos)
+        if m:
+            body = m.group(1) if m.lastindex == 1 else m.group(2)
+            self._advance_to(m.end())
+            return _unescape(body)
+        
+        # Unterminated literal: consume to end of input
+        quote = self.current_char()
+        self.advance()  # Skip opening quote
         value = ""
         while self.current_char() and self.current_char() != quote:
             if self.current_char() == '\\':
@@ -150,310 +273,327 @@ class Lexer:
         return value
     
     def read_multiline_string(self) -> str:
-        self.advance()  # Skip |
-        # Skip to next line
-        while self.current_char() and self.current_char() != '\n':
-            self.advance()
-        if self.current_char() == '\n':
-            self.advance()
+        src = self.source
+        n = len(src)
+        
+        # Skip | and the rest of its line
+        eol = src.find('\n', self.pos)
+        self._advance_to(eol + 1 if eol != -1 else n)
+        
+        pos = self.pos
+        line = self.line
+        column = self.column
         
         # Determine base indentation
-        base_indent = 0
-        while self.current_char() and self.current_char() in ' \t':
-            base_indent += 1
-            self.advance()
+        while pos < n and src[pos] in ' \t':
+            pos += 1
+        base_indent = pos - self.pos
+        column += base_indent
         
         lines = []
-        current_line = ""
         
-        while self.current_char():
-            # Check if we've reached the end (less indentation)
-            if self.current_char() == '\n':
-                lines.append(current_line)
-                current_line = ""
-                self.advance()
-                
-                # Count indentation of next line
-                indent = 0
-                start_pos = self.pos
-                while self.current_char() and self.current_char() in ' \t':
-                    indent += 1
-                    self.advance()
-                
-                # If less indented or empty line followed by less indented, we're done
-                if indent < base_indent and self.current_char() and self.current_char() not in '\n':
-                    self.pos = start_pos  # Reset position
-                    break
-            else:
-                current_line += self.advance()
-        
-        if current_line:
-            lines.append(current_line)
+        while pos < n:
+            eol = src.find('\n', pos)
+            if eol == -1:
+                # Last line runs to end of input
+                lines.append(src[pos:])
+                column += n - pos
+                pos = n
+                break
+            
+            lines.append(src[pos:eol])
+            pos = eol + 1
+            line += 1
+            column = 1
+            
+            # Count indentation of next line
+            start_pos = pos
+            while pos < n and src[pos] in ' \t':
+                pos += 1
+            indent = pos - start_pos
+            column += indent
+            
+            # If less indented or empty line followed by less indented, we're done
+            if indent < base_indent and pos < n and src[pos] != '\n':
+                pos = start_pos  # Reset position
+                break
         
+        self.pos = pos
+        self.line = line
+        self.column = column
         return '\n'.join(lines)
     
-    def read_number(self) -> Union[int, float]:
-        value = ""
-        has_dot = False
-        
-        while self.current_char() and (self.current_char().isdigit() or self.current_char() == '.'):
-            if self.current_char() == '.':
-                if has_dot:
-                    break
-                has_dot = True
-            value += self.advance()
-        
-        return float(value) if has_dot else int(value)
-    
-    def read_identifier(self) -> str:
-        value = ""
-        while self.current_char() and (self.current_char().isalnum() or self.current_char() in '_-'):
-            value += self.advance()
-        return value
-    
     def read_reference(self) -> str:
         self.advance()  # Skip @
-        reference = ""
+        src = self.source
         
         # Handle dynamic references @{...}
         if self.current_char() == '{':
+            m = _DYNAMIC_REF_RE.match(src, self.pos)
+            if m:
+                self._advance_to(m.end())
+                return m.group()
+            
+            # Deeper nesting or unterminated: count braces by hand
             self.advance()
+            n = len(src)
+            start = i = self.pos
             depth = 1
-            while depth > 0 and self.current_char():
-                if self.current_char() == '{':
+            while i < n:
+                if src[i] == '{':
                     depth += 1
-                elif self.current_char() == '}':
+                elif src[i] == '}':
                     depth -= 1
                     if depth == 0:
                         break
-                reference += self.advance()
+                i += 1
+            self._advance_to(i)
             self.advance()  # Skip closing }
-            return f"{{{reference}}}"
+            return f"{{{src[start:i]}}}"
         
         # Regular reference
-        while self.current_char() and (self.current_char().isalnum() or self.current_char() in '_.[]'):
-            reference += self.advance()
-        
-        return reference
-    
-    def tokenize(self) -> List[Token]:
-        while self.current_char():
-            self.skip_whitespace()
-            
-            if not self.current_char():
-                break
-            
-            line = self.line
-            column = self.column
-            
-            # Comments
-            if self.current_char() == '#':
-                self.skip_comment()
-                continue
-            
-            # Newline
-            if self.current_char() == '\n':
-                self.tokens.append(Token(TokenType.NEWLINE, '\n', line, column))
-                self.advance()
-                continue
-            
-            # Strings
-            if self.current_char() in '"\'':
-                value = self.read_string()
-                self.tokens.append(Token(TokenType.STRING, value, line, column))
-                continue
+        m = _REF_BODY_RE.match(src, self.pos)
+        self._advance_to(m.end())
+        return m.group()
+    
+    def tokenize(self) -> List[RawToken]:
+        src = self.source
+        tokens = self.tokens
+        match = _TOKEN_RE.match
+        intern = sys.intern
+        pos = self.pos
+        line = self.line
+        line_start = pos - self.column + 1  # offset of the current line's first char
+        
+        while True:
+            m = match(src, pos)
+            if m is None:
+                if pos >= len(src):
+                    break
+                column = pos - line_start + 1
+                raise SyntaxError(f"Unexpected character {src[pos]!r} at line {line}, column {column}")
             
-            # Multi-line strings
-            if self.current_char() == '|':
-                value = self.read_multiline_string()
-                self.tokens.append(Token(TokenType.STRING, value, line, column))
-                continue
+            kind = m.lastgroup
+            end = m.end()
             
-            # Numbers
-            if self.current_char().isdigit():
-                value = self.read_number()
-                self.tokens.append(Token(TokenType.NUMBER, value, line, column))
+            if kind == 'WS':
+                pos = end
                 continue
             
-            # References
-            if self.current_char() == '@':
-                value = self.read_reference()
-                self.tokens.append(Token(TokenType.REFERENCE, value, line, column))
-                continue
+            column = pos - line_start + 1
             
-            # Single character tokens
-            char = self.current_char()
-            if char == '{':
-                self.tokens.append(Token(TokenType.LBRACE, char, line, column))
-                self.advance()
-            elif char == '}':
-                self.tokens.append(Token(TokenType.RBRACE, char, line, column))
-                self.advance()
-            elif char == '[':
-                self.tokens.append(Token(TokenType.LBRACKET, char, line, column))
-                self.advance()
-            elif char == ']':
-                self.tokens.append(Token(TokenType.RBRACKET, char, line, column))
-                self.advance()
-            elif char == ':':
-                self.tokens.append(Token(TokenType.COLON, char, line, column))
-                self.advance()
-            elif char == ',':
-                self.tokens.append(Token(TokenType.COMMA, char, line, column))
-                self.advance()
+            if kind == 'NEWLINE':
+                tokens.append((_TAG_NEWLINE, '\n', line, column))
+                line += 1
+                line_start = end
+            elif kind == 'WORD':
+                word = m.group()
+                keyword = _KEYWORDS.get(word)
+                if keyword is None:
+                    # Identifiers become property keys and node ids; interning
+                    # shares one string object per distinct name
+                    tokens.append((_TAG_IDENTIFIER, intern(word), line, column))
+                else:
+                    tokens.append((keyword[0], keyword[1], line, column))
+            elif kind == 'PUNCT':
+                char = m.group()
+                tokens.append((_PUNCTUATION[char], char, line, column))
+            elif kind == 'REFERENCE':
+                tokens.append((_TAG_REFERENCE, src[pos + 1:end], line, column))
+            elif kind == 'NUMBER':
+                text = m.group()
+                value = float(text) if '.' in text else int(text)
+                tokens.append((_TAG_NUMBER, value, line, column))
+            elif kind == 'STRING' or kind == 'COMMENT':
+                if kind == 'STRING':
+                    tokens.append((_TAG_STRING, _unescape(src[pos + 1:end - 1]), line, column))
+                newlines = src.count('\n', pos, end)
+                if newlines:
+                    line += newlines
+                    line_start = src.rindex('\n', pos, end) + 1
             else:
-                # Keywords and identifiers
-                value = self.read_identifier()
-                if value == "def":
-                    self.tokens.append(Token(TokenType.DEF, value, line, column))
-                elif value in ["true", "false"]:
-                    self.tokens.append(Token(TokenType.BOOLEAN, value == "true", line, column))
-                elif value == "null":
-                    self.tokens.append(Token(TokenType.NULL, None, line, column))
+                # Multi-line strings, dynamic references and unterminated
+                # strings go through the character-level readers
+                self.pos, self.line, self.column = pos, line, column
+                char = src[pos]
+                if char == '|':
+                    tokens.append((_TAG_STRING, self.read_multiline_string(), line, column))
+                elif char == '@':
+                    tokens.append((_TAG_REFERENCE, self.read_reference(), line, column))
                 else:
-                    self.tokens.append(Token(TokenType.IDENTIFIER, value, line, column))
+                    tokens.append((_TAG_STRING, self.read_string(), line, column))
+                end = self.pos
+                line = self.line
+                line_start = end - self.column + 1
+            
+            pos = end
         
-        self.tokens.append(Token(TokenType.EOF, None, self.line, self.column))
-        return self.tokens
+        self.pos = pos
+        self.line = line
+        self.column = pos - line_start + 1
+        tokens.append((_TAG_EOF, None, self.line, self.column))
+        return tokens
 
 
 class Parser:
     """Parses tokens into an AST"""
     
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: List[RawToken]):
         self.tokens = tokens
         self.pos = 0
         self.graph = Graph()
     
-    def current_token(self) -> Token:
+    def current_token(self) -> RawToken:
         if self.pos >= len(self.tokens):
             return self.tokens[-1]  # Return EOF
         return self.tokens[self.pos]
     
-    def peek_token(self, offset: int = 1) -> Token:
+    def peek_token(self, offset: int = 1) -> RawToken:
         pos = self.pos + offset
         if pos >= len(self.tokens):
             return self.tokens[-1]
         return self.tokens[pos]
     
-    def advance(self) -> Token:
+    def advance(self) -> RawToken:
         token = self.current_token()
-        if token.type != TokenType.EOF:
+        if token[0] != _TAG_EOF:
             self.pos += 1
         return token
     
     def skip_newlines(self):
-        while self.current_token().type == TokenType.NEWLINE:
-            self.advance()
+        toks = self.tokens
+        pos = self.pos
+        while toks[pos][0] == _TAG_NEWLINE:
+            pos += 1
+        self.pos = pos
     
-    def expect(self, token_type: TokenType) -> Token:
+    def expect(self, tag: int) -> RawToken:
         token = self.current_token()
-        if token.type != token_type:
-            raise SyntaxError(f"Expected {token_type}, got {token.type} at line {token.line}")
+        if token[0] != tag:
+            raise SyntaxError(f"Expected {_TOKEN_TYPES[tag]}, got {_TOKEN_TYPES[token[0]]} at line {token[2]}")
         return self.advance()
     
+    # The parse_* methods below keep the cursor in a local pos and skip
+    # newlines inline. pos is stored back to self.pos around calls to other
+    # methods. The token list always ends with EOF, which is never a newline
+    # and is never advanced past, so toks[pos] needs no bounds check.
+    
     def parse_value(self) -> Any:
-        self.skip_newlines()
-        token = self.current_token()
-        
-        if token.type == TokenType.STRING:
-            return self.advance().value
-        elif token.type == TokenType.NUMBER:
-            return self.advance().value
-        elif token.type == TokenType.BOOLEAN:
-            return self.advance().value
-        elif token.type == TokenType.NULL:
-            self.advance()
+        toks = self.tokens
+        pos = self.pos
+        while toks[pos][0] == _TAG_NEWLINE:
+            pos += 1
+        token = toks[pos]
+        tag = token[0]
+        
+        if tag == _TAG_STRING or tag == _TAG_NUMBER or tag == _TAG_BOOLEAN:
+            self.pos = pos + 1
+            return token[1]
+        elif tag == _TAG_NULL:
+            self.pos = pos + 1
             return None
-        elif token.type == TokenType.REFERENCE:
-            return f"@{self.advance().value}"
-        elif token.type == TokenType.LBRACKET:
+        elif tag == _TAG_REFERENCE:
+            self.pos = pos + 1
+            return f"@{token[1]}"
+        
+        self.pos = pos
+        if tag == _TAG_LBRACKET:
             return self.parse_array()
-        elif token.type == TokenType.LBRACE:
+        elif tag == _TAG_LBRACE:
             return self.parse_object()
         else:
-            raise SyntaxError(f"Unexpected token {token.type} at line {token.line}")
+            raise SyntaxError(f"Unexpected token {_TOKEN_TYPES[tag]} at line {token[2]}")
     
     def parse_array(self) -> List[Any]:
-        self.expect(TokenType.LBRACKET)
-        self.skip_newlines()
+        self.expect(_TAG_LBRACKET)
+        toks = self.tokens
+        pos = self.pos
+        while toks[pos][0] == _TAG_NEWLINE:
+            pos += 1
         
         items = []
-        while self.current_token().type != TokenType.RBRACKET:
+        while toks[pos][0] != _TAG_RBRACKET:
+            self.pos = pos
             items.append(self.parse_value())
-            self.skip_newlines()
+            pos = self.pos
+            while toks[pos][0] == _TAG_NEWLINE:
+                pos += 1
             
-            if self.current_token().type == TokenType.COMMA:
-                self.advance()
-                self.skip_newlines()
-            elif self.current_token().type != TokenType.RBRACKET:
+            tag = toks[pos][0]
+            if tag == _TAG_COMMA:
+                pos += 1
+                while toks[pos][0] == _TAG_NEWLINE:
+                    pos += 1
+            elif tag != _TAG_RBRACKET:
                 break
         
-        self.expect(TokenType.RBRACKET)
+        self.pos = pos
+        self.expect(_TAG_RBRACKET)
         return items
     
     def parse_object(self) -> Dict[str, Any]:
-        self.expect(TokenType.LBRACE)
-        self.skip_newlines()
+        self.expect(_TAG_LBRACE)
+        toks = self.tokens
+        pos = self.pos
+        while toks[pos][0] == _TAG_NEWLINE:
+            pos += 1
         
         obj = {}
-        while self.current_token().type != TokenType.RBRACE:
+        while toks[pos][0] == _TAG_IDENTIFIER:
             # Parse key
-            if self.current_token().type != TokenType.IDENTIFIER:
-                break
-            
-            key = self.advance().value
-            self.expect(TokenType.COLON)
-            value = self.parse_value()
-            obj[key] = value
+            key = toks[pos][1]
+            self.pos = pos + 1
+            self.expect(_TAG_COLON)
+            obj[key] = self.parse_value()
             
-            self.skip_newlines()
-            if self.current_token().type == TokenType.COMMA:
-                self.advance()
-                self.skip_newlines()
-        
-        self.expect(TokenType.RBRACE)
+            pos = self.pos
+            while toks[pos][0] == _TAG_NEWLINE:
+                pos += 1
+            if toks[pos][0] == _TAG_COMMA:
+                pos += 1
+                while toks[pos][0] == _TAG_NEWLINE:
+                    pos += 1
+        
+        self.pos = pos
+        self.expect(_TAG_RBRACE)
         return obj
     
     def parse_properties(self) -> Dict[str, Any]:
-        self.expect(TokenType.LBRACE)
-        self.skip_newlines()
-        
+        self.expect(_TAG_LBRACE)
+        toks = self.tokens
+        pos = self.pos
+        while toks[pos][0] == _TAG_NEWLINE:
+            pos += 1
+        
+        # Metadata is stored under "@meta" like any other key and split out
+        # by parse_definition
         properties = {}
-        while self.current_token().type != TokenType.RBRACE:
-            if self.current_token().type != TokenType.IDENTIFIER:
-                break
-            
-            key = self.advance().value
+        while toks[pos][0] == _TAG_IDENTIFIER:
+            key = toks[pos][1]
+            self.pos = pos + 1
+            self.expect(_TAG_COLON)
+            properties[key] = self.parse_value()
             
-            # Handle metadata
-            if key == "@meta":
-                self.expect(TokenType.COLON)
-                metadata = self.parse_value()
-                properties["@meta"] = metadata
-            else:
-                self.expect(TokenType.COLON)
-                value = self.parse_value()
-                properties[key] = value
-            
-            self.skip_newlines()
+            pos = self.pos
+            while toks[pos][0] == _TAG_NEWLINE:
+                pos += 1
         
-        self.expect(TokenType.RBRACE)
+        self.pos = pos
+        self.expect(_TAG_RBRACE)
         return properties
     
     def parse_definition(self):
-        self.expect(TokenType.DEF)
+        self.expect(_TAG_DEF)
         
         # Parse node type
-        type_token = self.expect(TokenType.IDENTIFIER)
-        try:
-            node_type = NodeType(type_token.value)
-        except ValueError:
-            raise SyntaxError(f"Unknown node type '{type_token.value}' at line {type_token.line}")
+        type_token = self.expect(_TAG_IDENTIFIER)
+        node_type = _NODE_TYPE_BY_VALUE.get(type_token[1])
+        if node_type is None:
+            raise SyntaxError(f"Unknown node type '{type_token[1]}' at line {type_token[2]}")
         
         # Parse node ID
-        id_token = self.expect(TokenType.IDENTIFIER)
-        node_id = id_token.value
+        id_token = self.expect(_TAG_IDENTIFIER)
+        node_id = id_token[1]
         
         # Parse properties
         properties = self.parse_properties()
@@ -467,46 +607,85 @@ class Parser:
             id=node_id,
             properties=properties,
             metadata=metadata,
-            line=type_token.line
+            line=type_token[2]
         )
         
         # Add to graph
         self.graph.nodes[node_id] = node
     
     def parse(self) -> Graph:
-        while self.current_token().type != TokenType.EOF:
-            self.skip_newlines()
+        toks = self.tokens
+        while True:
+            pos = self.pos
+            while toks[pos][0] == _TAG_NEWLINE:
+                pos += 1
             
-            if self.current_token().type == TokenType.DEF:
+            tag = toks[pos][0]
+            if tag == _TAG_DEF:
+                self.pos = pos
                 self.parse_definition()
-            elif self.current_token().type == TokenType.EOF:
+            elif tag == _TAG_EOF:
+                self.pos = pos
                 break
             else:
                 # Skip unknown tokens
-                self.advance()
+                self.pos = pos + 1
         
         return self.graph
 
 
+# Fields copied from node properties into compiled views and flows, in
+# output order, with a factory for the value used when the key is absent
+_VIEW_FIELDS = (
+    ("task", None),
+    ("role", None),
+    ("model", None),
+    ("policy", None),
+    ("selectors", list),
+    ("prompt", dict),
+    ("response_format", None),
+    ("post_process", list),
+    ("asserts", list),
+)
+
+_FLOW_FIELDS = (
+    ("entry", None),
+    ("edges", list),
+    ("parallel", None),
+    ("sequential", None),
+    ("conditional", None),
+    ("error_handling", None),
+    ("schedule", None),
+)
+
+
 class Compiler:
     """Compiles a Graph into IR (Intermediate Representation)"""
     
     def __init__(self, graph: Graph):
         self.graph = graph
         self.ir = {
-            "version": "1.0.0",
+            "version": __version__,
             "metadata": graph.metadata,
             "nodes": {},
             "views": [],
             "flows": [],
             "tests": []
         }
+        # Resolved static references, keyed by raw ref string; the graph
+        # does not change while compiling
+        self._ref_cache: Dict[str, Any] = {}
     
     def resolve_reference(self, ref: str, context: Dict[str, Any]) -> Any:
         """Resolve @ references"""
         if not ref.startswith("@"):
             return ref
         
+        cache = self._ref_cache
+        if ref in cache:
+            return cache[ref]
+        
+        raw = ref
         ref = ref[1:]  # Remove @
         
         # Handle dynamic references
@@ -526,16 +705,18 @@ class Compiler:
         
         # If just node reference, return node ID
         if len(parts) == 1:
-            return f"@{node_id}"
-        
-        # Navigate properties
-        value = node.properties
-        for part in parts[1:]:
-            if isinstance(value, dict) and part in value:
-                value = value[part]
-            else:
-                return f"@{ref}"  # Return unresolved
+            value = f"@{node_id}"
+        else:
+            # Navigate properties
+            value = node.properties
+            for part in parts[1:]:
+                if isinstance(value, dict) and part in value:
+                    value = value[part]
+                else:
+                    value = f"@{ref}"  # Return unresolved
+                    break
         
+        cache[raw] = value
         return value
     
     def compile_node(self, node: Node) -> Dict[str, Any]:
@@ -547,18 +728,7 @@ class Compiler:
         }
         
         # Process properties
-        for key, value in node.properties.items():
-            if isinstance(value, str) and value.startswith("@"):
-                compiled["properties"][key] = self.resolve_reference(value, {})
-            elif isinstance(value, list):
-                compiled["properties"][key] = [
-                    self.resolve_reference(v, {}) if isinstance(v, str) and v.startswith("@") else v
-                    for v in value
-                ]
-            elif isinstance(value, dict):
-                compiled["properties"][key] = self.compile_object(value)
-            else:
-                compiled["properties"][key] = value
+        compiled["properties"] = self.compile_object(node.properties)
         
         if node.metadata:
             compiled["metadata"] = node.metadata
@@ -567,62 +737,71 @@ class Compiler:
     
     def compile_object(self, obj: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively compile an object"""
-        compiled = {}
-        for key, value in obj.items():
-            if isinstance(value, str) and value.startswith("@"):
-                compiled[key] = self.resolve_reference(value, {})
-            elif isinstance(value, list):
-                compiled[key] = [
-                    self.resolve_reference(v, {}) if isinstance(v, str) and v.startswith("@") else v
-                    for v in value
-                ]
-            elif isinstance(value, dict):
-                compiled[key] = self.compile_object(value)
+        return self._compile_value(obj)
+    
+    def _compile_value(self, value: Any) -> Any:
+        """Resolve @ references in a property value
+        
+        Dicts are resolved at any depth; lists only resolve their own string
+        entries and keep nested dicts and lists as written.
+        """
+        t = type(value)
+        if t is str:
+            return self.resolve_reference(value, {}) if value[:1] == "@" else value
+        resolve = self.resolve_reference
+        if t is list:
+            return [resolve(v, {}) if type(v) is str and v[:1] == "@" else v for v in value]
+        if t is not dict:
+            return value
+        
+        # Walk nested dicts with an explicit stack of (items, copy) pairs
+        # instead of recursing; entries are visited in document order
+        root = {}
+        stack = [(iter(value.items()), root)]
+        while stack:
+            items, out = stack[-1]
+            for key, v in items:
+                t = type(v)
+                if t is str:
+                    out[key] = resolve(v, {}) if v[:1] == "@" else v
+                elif t is dict:
+                    out[key] = child = {}
+                    stack.append((iter(v.items()), child))
+                    break
+                elif t is list:
+                    out[key] = [resolve(x, {}) if type(x) is str and x[:1] == "@" else x for x in v]
+                else:
+                    out[key] = v
             else:
-                compiled[key] = value
-        return compiled
+                stack.pop()
+        
+        return root
     
     def compile_view(self, node: Node) -> Dict[str, Any]:
         """Compile a view node into executable form"""
-        view = {
-            "id": node.id,
-            "type": "view",
-            "task": node.properties.get("task"),
-            "role": node.properties.get("role"),
-            "model": node.properties.get("model"),
-            "policy": node.properties.get("policy"),
-            "selectors": node.properties.get("selectors", []),
-            "prompt": node.properties.get("prompt", {}),
-            "response_format": node.properties.get("response_format"),
-            "post_process": node.properties.get("post_process", []),
-            "asserts": node.properties.get("asserts", [])
-        }
-        
-        # Process selectors
-        compiled_selectors = []
-        for selector in view["selectors"]:
-            compiled_selector = self.compile_object(selector) if isinstance(selector, dict) else selector
-            compiled_selectors.append(compiled_selector)
-        view["selectors"] = compiled_selectors
+        props = node.properties
+        view = {"id": node.id, "type": "view"}
+        for key, default in _VIEW_FIELDS:
+            view[key] = props[key] if key in props else (default() if default else None)
+        
+        # Only selectors are resolved; task, role, model and the like stay
+        # '@id' node pointers for the runtime
+        view["selectors"] = [
+            self._compile_value(selector) if isinstance(selector, dict) else selector
+            for selector in view["selectors"]
+        ]
         
         return view
     
     def compile_flow(self, node: Node) -> Dict[str, Any]:
         """Compile a flow node"""
-        flow = {
-            "id": node.id,
-            "type": "flow",
-            "entry": node.properties.get("entry"),
-            "edges": node.properties.get("edges", []),
-            "parallel": node.properties.get("parallel"),
-            "sequential": node.properties.get("sequential"),
-            "conditional": node.properties.get("conditional"),
-            "error_handling": node.properties.get("error_handling"),
-            "schedule": node.properties.get("schedule")
-        }
-        
-        # Remove None values
-        flow = {k: v for k, v in flow.items() if v is not None}
+        props = node.properties
+        flow = {"id": node.id, "type": "flow"}
+        for key, default in _FLOW_FIELDS:
+            value = props[key] if key in props else (default() if default else None)
+            # Leave out unset fields
+            if value is not None:
+                flow[key] = value
         
         return flow
     
@@ -631,19 +810,25 @@ class Compiler:
         
         # Compile all nodes
         for node_id, node in self.graph.nodes.items():
-            self.ir["nodes"][node_id] = self.compile_node(node)
+            compiled = self.compile_node(node)
+            self.ir["nodes"][node_id] = compiled
             
-            # Special handling for views, flows, and tests
+            # Special handling for views, flows, and tests; tests reuse the
+            # compiled node
             if node.type == NodeType.VIEW:
                 self.ir["views"].append(self.compile_view(node))
             elif node.type == NodeType.FLOW:
                 self.ir["flows"].append(self.compile_flow(node))
             elif node.type == NodeType.TEST:
-                self.ir["tests"].append(self.compile_node(node))
+                self.ir["tests"].append(compiled)
         
         return self.ir
 
 
+# Source files at least this large are memory-mapped instead of read
+_MMAP_THRESHOLD = 1024 * 1024
+
+
 def compile_chord(source: str) -> Dict[str, Any]:
     """Main compilation function"""
     
@@ -664,8 +849,18 @@ def compile_chord(source: str) -> Dict[str, Any]:
 
 def compile_file(filepath: Path) -> Dict[str, Any]:
     """Compile a .chord file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        source = f.read()
+    # Large files are decoded straight from a read-only mapping rather than
+    # copied into a bytes buffer first
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                source = str(data, 'utf-8')
+        else:
+            source = f.read().decode('utf-8')
+    
+    # Same newline handling as reading the file in text mode
+    if '\r' in source:
+        source = source.replace('\r\n', '\n').replace('\r', '\n')
     
     return compile_chord(source)
 
@@ -699,18 +894,12 @@ def main():
         # Output
         if args.output:
             output_path = Path(args.output)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                if args.pretty:
-                    json.dump(ir, f, indent=2)
-                else:
-                    json.dump(ir, f)
+            output_path.write_bytes(_dumps(ir, args.pretty))
             print(f"✓ Compiled to {output_path}")
         else:
             # Print to stdout
-            if args.pretty:
-                print(json.dumps(ir, indent=2))
-            else:
-                print(json.dumps(ir))
+            sys.stdout.flush()
+            sys.stdout.buffer.write(_dumps(ir, args.pretty) + b"\n")
     
     except SyntaxError as e:
         print(f"Syntax Error: {e}", file=sys.stderr)
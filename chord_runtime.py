@@ -6,20 +6,58 @@ CHORD Runtime - Executes compiled CHORD IR with selector operations
 import os
 import re
 import json
+import math
 import hashlib
-import subprocess
 import asyncio
-from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Callable
+import fnmatch
+import functools
+import inspect
+import heapq
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Any, Optional, Tuple, Union, Callable
 from dataclasses import dataclass, field
+from operator import itemgetter
 from abc import ABC, abstractmethod
 from datetime import datetime
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _has_nonfinite(obj: Any) -> bool:
+    """Whether a JSON payload holds a NaN or infinite float anywhere"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+# Pretty-print JSON with orjson when it is installed; _dumps returns UTF-8 bytes
+try:
+    import orjson
+    
+    def _dumps(obj: Any, default: Optional[Callable] = None) -> bytes:
+        try:
+            data = orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # Non-str keys, integers beyond 64 bits: leave these to the stdlib
+            return json.dumps(obj, indent=2, default=default).encode('utf-8')
+        # orjson writes NaN and infinities as null where json writes
+        # NaN/Infinity; only payloads containing null need the walk
+        if b'null' in data and _has_nonfinite(obj):
+            return json.dumps(obj, indent=2, default=default).encode('utf-8')
+        return data
+except ImportError:
+    def _dumps(obj: Any, default: Optional[Callable] = None) -> bytes:
+        return json.dumps(obj, indent=2, default=default).encode('utf-8')
+
 
 @dataclass
 class ExecutionContext:
@@ -28,18 +66,125 @@ class ExecutionContext:
     memory: Dict[str, Any] = field(default_factory=dict)
     cache: Dict[str, Any] = field(default_factory=dict)
     resolved_contexts: Dict[str, Any] = field(default_factory=dict)
+    env_signals: Dict[str, str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Snapshot CHORD_* environment variables, keyed by the upper-cased
+        # signal name, so lookups skip os.environ's per-access key encoding
+        self.env_signals = {
+            key[6:]: value for key, value in os.environ.items() if key.startswith('CHORD_')
+        }
     
     def get_signal(self, name: str) -> Any:
         """Get signal value"""
         if name in self.signals:
             return self.signals[name]
         # Check environment variables
-        env_name = f"CHORD_{name.upper()}"
-        if env_name in os.environ:
-            return os.environ[env_name]
+        return self.env_signals.get(name.upper())
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(pattern: str, flags: int = 0) -> "re.Pattern[str]":
+    """Compile and cache a regex pattern"""
+    return re.compile(pattern, flags)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_ref(ref: str) -> Tuple[str, str]:
+    """Split an '@node.path' reference into its node id and the rest of the path"""
+    node_id, _, rest = ref[1:].partition('.')
+    return node_id, rest
+
+
+_SIGNAL_RE = re.compile(r'{{signal\.(\w+)}}')
+
+# Start of every {{...}} placeholder; the lookahead also finds placeholders
+# that begin inside an unclosed one
+_PLACEHOLDER_RE = re.compile(r'(?=\{\{(.*?)\}\})', re.DOTALL)
+
+# Line boundaries str.splitlines() honours besides '\n'
+_OTHER_LINE_BREAKS = '\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+# Any regex metacharacter; patterns without one are plain substrings
+_REGEX_META = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+
+def _only_newline_breaks(text: Union[str, bytes]) -> bool:
+    """Whether '\n' is the only line boundary splitlines() would find in text"""
+    if isinstance(text, bytes):
+        return b'\r' not in text
+    return not any(char in text for char in _OTHER_LINE_BREAKS)
+
+
+def _read_text(path: Path) -> str:
+    """Read a whole UTF-8 text file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _mtime_ns(uri: str) -> Optional[int]:
+    """Modification time of the path behind a context URI, or None"""
+    path = uri[5:] if uri.startswith("fs://") else uri
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, ValueError):
         return None
 
 
+def _content_digest(data: Any) -> Tuple[bytes, int]:
+    """Content digest and encoded size of fetched context data"""
+    hasher = hashlib.blake2b(type(data).__name__.encode(), digest_size=16)
+    chunks = [c for item in data.items() for c in item] if isinstance(data, dict) else [data]
+    size = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            kind, encoded = b's', chunk.encode('utf-8', 'surrogatepass')
+        elif isinstance(chunk, bytes):
+            kind, encoded = b'b', chunk
+        else:
+            kind, encoded = b'r', repr(chunk).encode('utf-8', 'surrogatepass')
+        # Length-prefix each chunk so different splits never hash the same
+        hasher.update(kind + len(encoded).to_bytes(8, 'little'))
+        hasher.update(encoded)
+        size += len(encoded)
+    return hasher.digest(), size
+
+
+def _path_matcher(patterns: List[str]) -> Callable[[Path], bool]:
+    """Predicate equivalent to any(path.match(p) for p in patterns), with every glob translated once"""
+    if os.name == 'nt':
+        return lambda path: any(path.match(pattern) for pattern in patterns)
+    
+    # PurePath.match compares pattern components against the path's trailing
+    # components with fnmatch, so single-component patterns only ever see the
+    # final component and can share one regex
+    names = []
+    tails = []
+    others = []
+    for pattern in patterns:
+        pure = PurePosixPath(pattern)
+        parts = pure.parts
+        if not parts or pure.anchor:
+            # Empty or anchored: leave to PurePath.match
+            others.append(pattern)
+        elif len(parts) == 1:
+            names.append(fnmatch.translate(parts[0]))
+        else:
+            tails.append([_compile(fnmatch.translate(part)).match for part in reversed(parts)])
+    names_match = _compile('|'.join(names)).match if names else None
+    
+    def matches(path: Path) -> bool:
+        parts = path.parts
+        if names_match is not None and parts and names_match(parts[-1]):
+            return True
+        for tail in tails:
+            if len(tail) <= len(parts) and all(match(part) for match, part in zip(tail, reversed(parts))):
+                return True
+        return any(path.match(pattern) for pattern in others)
+    
+    return matches
+
+
 class ContextSource(ABC):
     """Abstract base for context sources"""
     
@@ -49,20 +194,20 @@ class ContextSource(ABC):
 
 
 class FileContextSource(ContextSource):
-    """File system context source"""
+    """File system context source; binary=True returns the raw bytes undecoded"""
     
-    async def fetch(self, uri: str, **kwargs) -> str:
+    async def fetch(self, uri: str, binary: bool = False, **kwargs) -> Union[str, bytes]:
         if uri.startswith("fs://"):
             path = uri[5:]  # Remove fs:// prefix
         else:
             path = uri
         
         path = Path(path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {path}")
-        
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # Open directly rather than stat-ing first, saving a syscall per read
+        try:
+            return path.read_bytes() if binary else _read_text(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {path}") from None
 
 
 class DirectoryContextSource(ContextSource):
@@ -81,27 +226,40 @@ class DirectoryContextSource(ContextSource):
         include = kwargs.get('include', ['**/*'])
         exclude = kwargs.get('exclude', [])
         
-        files = {}
+        excluded = _path_matcher(exclude)
+        
+        # Collect matching files first; a file matched by several include
+        # patterns is read once
+        targets = {}
         for pattern in include:
             for file_path in path.glob(pattern):
-                if file_path.is_file():
-                    # Check exclusions
-                    excluded = False
-                    for exc_pattern in exclude:
-                        if file_path.match(exc_pattern):
-                            excluded = True
-                            break
-                    
-                    if not excluded:
-                        relative_path = file_path.relative_to(path)
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            files[str(relative_path)] = f.read()
+                if file_path.is_file() and not excluded(file_path):
+                    targets[str(file_path.relative_to(path))] = file_path
         
-        return files
+        # Read concurrently on the default executor so file I/O overlaps
+        # and never blocks the event loop
+        loop = asyncio.get_running_loop()
+        contents = await asyncio.gather(
+            *(loop.run_in_executor(None, _read_text, file_path) for file_path in targets.values())
+        )
+        
+        return dict(zip(targets, contents))
 
 
 class SelectorOperation(ABC):
-    """Abstract base for selector operations"""
+    """Abstract base for selector operations that compute their result directly"""
+    
+    # Whether execute handles bytes from binary context sources; other
+    # operations receive the data decoded as UTF-8
+    accepts_bytes = False
+    
+    @abstractmethod
+    def execute(self, data: Any, params: Dict[str, Any]) -> Any:
+        pass
+
+
+class AsyncSelectorOperation(SelectorOperation):
+    """Abstract base for selector operations that need to await I/O"""
     
     @abstractmethod
     async def execute(self, data: Any, params: Dict[str, Any]) -> Any:
@@ -111,33 +269,82 @@ class SelectorOperation(ABC):
 class HeadSelector(SelectorOperation):
     """Extract first N lines"""
     
-    async def execute(self, data: str, params: Dict[str, Any]) -> str:
+    accepts_bytes = True
+    
+    def execute(self, data: str, params: Dict[str, Any]) -> str:
         lines = params.get('lines', 100)
-        if isinstance(data, str):
-            return '\n'.join(data.splitlines()[:lines])
+        if isinstance(data, (str, bytes)):
+            newline = '\n' if isinstance(data, str) else b'\n'
+            if isinstance(lines, int) and lines > 0:
+                # Find the end of the first N lines without splitting the rest
+                pos = -1
+                for _ in range(lines):
+                    pos = data.find(newline, pos + 1)
+                    if pos < 0:
+                        break
+                if pos >= 0:
+                    head = data[:pos]
+                else:
+                    head = data[:-1] if data.endswith(newline) else data
+                if _only_newline_breaks(head):
+                    return head
+            return newline.join(data.splitlines()[:lines])
         return data
 
 
 class TailSelector(SelectorOperation):
     """Extract last N lines"""
     
-    async def execute(self, data: str, params: Dict[str, Any]) -> str:
+    accepts_bytes = True
+    
+    def execute(self, data: str, params: Dict[str, Any]) -> str:
         lines = params.get('lines', 100)
-        if isinstance(data, str):
-            return '\n'.join(data.splitlines()[-lines:])
+        if isinstance(data, (str, bytes)):
+            newline = '\n' if isinstance(data, str) else b'\n'
+            if isinstance(lines, int) and lines > 0:
+                # Find the start of the last N lines scanning backwards
+                end = len(data) - 1 if data.endswith(newline) else len(data)
+                pos = end
+                for _ in range(lines):
+                    pos = data.rfind(newline, 0, pos)
+                    if pos < 0:
+                        break
+                tail = data[pos + 1:end]
+                if _only_newline_breaks(tail):
+                    return tail
+            return newline.join(data.splitlines()[-lines:])
         return data
 
 
 class ExtractSelector(SelectorOperation):
     """Extract specific sections or patterns"""
     
-    async def execute(self, data: str, params: Dict[str, Any]) -> str:
+    def execute(self, data: str, params: Dict[str, Any]) -> str:
         if 'sections' in params:
             # Extract markdown sections
             sections = params['sections']
             if not isinstance(sections, list):
                 sections = [sections]
             
+            if _only_newline_breaks(data):
+                # Slice each matching section out of the buffer between
+                # consecutive header line offsets
+                starts = [0] if data.startswith('#') else []
+                pos = data.find('\n#')
+                while pos >= 0:
+                    starts.append(pos + 1)
+                    pos = data.find('\n#', pos + 1)
+                ends = [start - 1 for start in starts[1:]]
+                ends.append(len(data) - 1 if data.endswith('\n') else len(data))
+                
+                extracted = []
+                for start, end in zip(starts, ends):
+                    header_end = data.find('\n', start, end)
+                    header = data[start:end if header_end < 0 else header_end]
+                    if any(s in header for s in sections):
+                        extracted.append(data[start:end])
+                return '\n\n'.join(extracted)
+            
             extracted = []
             current_section = None
             current_content = []
@@ -163,7 +370,7 @@ class ExtractSelector(SelectorOperation):
         elif 'pattern' in params:
             # Extract using regex
             pattern = params['pattern']
-            matches = re.findall(pattern, data, re.MULTILINE)
+            matches = _compile(pattern, re.MULTILINE).findall(data)
             return '\n'.join(matches)
         
         elif 'lines' in params:
@@ -179,27 +386,46 @@ class ExtractSelector(SelectorOperation):
 class GrepSelector(SelectorOperation):
     """Search for patterns in text"""
     
-    async def execute(self, data: str, params: Dict[str, Any]) -> str:
+    accepts_bytes = True
+    
+    def execute(self, data: str, params: Dict[str, Any]) -> str:
         pattern = params.get('pattern', '')
         context_lines = params.get('context', 0)
         
+        literal = _REGEX_META.search(pattern) is None
+        if isinstance(data, bytes):
+            pattern = pattern.encode('utf-8')
+            newline, separator = b'\n', b'\n---\n'
+        else:
+            newline, separator = '\n', '\n---\n'
+        
+        if literal and isinstance(data, (str, bytes)) and pattern not in data:
+            # Plain substring missing from the whole buffer: one C-level scan,
+            # no line split
+            return data[:0]
+        
         lines = data.splitlines()
-        matches = []
+        if literal:
+            # Test lines with 'in' instead of the regex engine
+            hits = [i for i, line in enumerate(lines) if pattern in line]
+        else:
+            search = _compile(pattern).search
+            hits = [i for i, line in enumerate(lines) if search(line)]
         
-        for i, line in enumerate(lines):
-            if re.search(pattern, line):
-                start = max(0, i - context_lines)
-                end = min(len(lines), i + context_lines + 1)
-                match_with_context = lines[start:end]
-                matches.append('\n'.join(match_with_context))
+        matches = []
+        for i in hits:
+            start = max(0, i - context_lines)
+            end = min(len(lines), i + context_lines + 1)
+            match_with_context = lines[start:end]
+            matches.append(newline.join(match_with_context))
         
-        return '\n---\n'.join(matches)
+        return separator.join(matches)
 
 
 class SummarizeSelector(SelectorOperation):
     """Summarize text (placeholder - would use LLM in production)"""
     
-    async def execute(self, data: str, params: Dict[str, Any]) -> str:
+    def execute(self, data: str, params: Dict[str, Any]) -> str:
         max_tokens = params.get('max_tokens', 500)
         
         # Simple truncation for demo - in production, use LLM
@@ -217,19 +443,21 @@ class SummarizeSelector(SelectorOperation):
 class TransformSelector(SelectorOperation):
     """Transform data format"""
     
-    async def execute(self, data: Any, params: Dict[str, Any]) -> str:
+    def execute(self, data: Any, params: Dict[str, Any]) -> str:
         to_format = params.get('to', 'json')
         
         if to_format == 'json':
             if isinstance(data, str):
+                # Parse with json, which keeps integers beyond 64 bits and
+                # NaN/Infinity that orjson would turn into floats or null
                 try:
                     # Try to parse as JSON/dict
                     parsed = json.loads(data)
-                    return json.dumps(parsed, indent=2)
                 except:
                     return data
+                return _dumps(parsed).decode('utf-8')
             else:
-                return json.dumps(data, indent=2)
+                return _dumps(data).decode('utf-8')
         
         elif to_format == 'yaml':
             # Simplified YAML output
@@ -249,24 +477,33 @@ class TransformSelector(SelectorOperation):
 class SemanticSearchSelector(SelectorOperation):
     """Semantic search (placeholder - would use embeddings in production)"""
     
-    async def execute(self, data: str, params: Dict[str, Any]) -> str:
+    def execute(self, data: str, params: Dict[str, Any]) -> str:
         query = params.get('query', '')
         top_k = params.get('top_k', 5)
         
         # Simple keyword matching for demo - in production, use embeddings
-        lines = data.splitlines()
-        query_words = set(query.lower().split())
+        query_words = frozenset(query.lower().split())
+        
+        # Lowercase the buffer once; its lines stay aligned with the originals.
+        # If no query word occurs anywhere in it, no line can score.
+        data_lower = data.lower()
+        if not any(word in data_lower for word in query_words):
+            return ''
         
         scored_lines = []
-        for line in lines:
-            line_words = set(line.lower().split())
-            score = len(query_words.intersection(line_words))
+        for line, line_lower in zip(data.splitlines(), data_lower.splitlines()):
+            score = len(query_words.intersection(line_lower.split()))
             if score > 0:
                 scored_lines.append((score, line))
         
-        # Sort by score and return top K
-        scored_lines.sort(key=lambda x: x[0], reverse=True)
-        top_lines = [line for score, line in scored_lines[:top_k]]
+        # Take the top K by score; nlargest keeps ties in document order
+        # like a stable sort, but negative K still means slicing
+        if isinstance(top_k, int) and top_k >= 0:
+            top_scored = heapq.nlargest(top_k, scored_lines, key=itemgetter(0))
+        else:
+            scored_lines.sort(key=itemgetter(0), reverse=True)
+            top_scored = scored_lines[:top_k]
+        top_lines = [line for score, line in top_scored]
         
         return '\n'.join(top_lines)
 
@@ -296,48 +533,178 @@ class SelectorRegistry:
 class ContextManager:
     """Manages context sources and caching"""
     
-    def __init__(self):
+    def __init__(self, maxsize: int = 256, max_bytes: int = 64 * 1024 * 1024):
         self.sources: Dict[str, ContextSource] = {
             'file': FileContextSource(),
             'dir': DirectoryContextSource(),
         }
-        self.cache: Dict[str, Any] = {}
+        # LRU of cache key -> (source mtime, content digest). Data lives in
+        # self.blobs keyed by digest, so URIs with identical content share
+        # one object; each blob is [data, size, reference count].
+        self.cache: "OrderedDict[str, Tuple[Optional[int], bytes]]" = OrderedDict()
+        self.blobs: Dict[bytes, List[Any]] = {}
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.cached_bytes = 0
+    
+    def _evict(self, cache_key: str):
+        _, digest = self.cache.pop(cache_key)
+        blob = self.blobs[digest]
+        blob[2] -= 1
+        if not blob[2]:
+            del self.blobs[digest]
+            self.cached_bytes -= blob[1]
+    
+    def _store(self, cache_key: str, mtime: Optional[int], data: Any) -> Any:
+        # Concurrent fetches of the same context can both miss and store
+        if cache_key in self.cache:
+            self._evict(cache_key)
+        
+        digest, size = _content_digest(data)
+        blob = self.blobs.get(digest)
+        if blob is None:
+            blob = self.blobs[digest] = [data, size, 0]
+            self.cached_bytes += size
+        blob[2] += 1
+        self.cache[cache_key] = (mtime, digest)
+        
+        # Drop least recently used entries over the limits, keeping the new one
+        cache = self.cache
+        while len(cache) > 1 and (len(cache) > self.maxsize or self.cached_bytes > self.max_bytes):
+            self._evict(next(iter(cache)))
+        
+        return blob[0]
     
     async def fetch_context(self, node: Dict[str, Any]) -> Any:
         """Fetch context from a source"""
-        ctx_type = node['properties'].get('type', 'file')
-        uri = node['properties'].get('uri', '')
+        properties = node['properties']
+        ctx_type = properties.get('type', 'file')
+        uri = properties.get('uri', '')
         
-        # Check cache
+        # Check cache; entries for paths whose mtime changed are refetched.
+        # A directory's own mtime catches added and removed files but not
+        # edits to existing ones.
         cache_key = f"{ctx_type}:{uri}"
-        if cache_key in self.cache:
-            logger.debug(f"Cache hit for {cache_key}")
-            return self.cache[cache_key]
+        if properties.get('binary'):
+            cache_key += ":binary"
+        mtime = _mtime_ns(uri)
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            if entry[0] == mtime:
+                logger.debug(f"Cache hit for {cache_key}")
+                self.cache.move_to_end(cache_key)
+                return self.blobs[entry[1]][0]
+            self._evict(cache_key)
         
         # Fetch from source
         if ctx_type in self.sources:
             source = self.sources[ctx_type]
-            data = await source.fetch(uri, **node['properties'])
-            self.cache[cache_key] = data
-            return data
+            options = {k: v for k, v in properties.items() if k != 'uri'}
+            data = await source.fetch(uri, **options)
+            return self._store(cache_key, mtime, data)
         else:
             raise ValueError(f"Unknown context type: {ctx_type}")
 
 
+@functools.lru_cache(maxsize=1024)
+def _placeholder_names(template: str) -> Optional[frozenset]:
+    """Names of a template's {{name}} placeholders, from a single scan
+    
+    Returns None when runs of three braces make placeholder boundaries
+    ambiguous.
+    """
+    if '{{{' in template or '}}}' in template:
+        return None
+    return frozenset(_PLACEHOLDER_RE.findall(template))
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable key for a template variable that tells apart values whose str() differs"""
+    if value is None or type(value) in (str, int, bool):
+        return (type(value), value)
+    return (type(value), hashlib.blake2b(repr(value).encode('utf-8', 'surrogatepass'), digest_size=16).digest())
+
+
 class PromptRenderer:
     """Renders prompt templates"""
     
-    def __init__(self, context: ExecutionContext):
+    def __init__(self, context: ExecutionContext, cache_size: int = 4096, max_chars: int = 16 * 1024 * 1024):
         self.context = context
+        # LRU of variable substitution results keyed by template and the
+        # frozen variables it uses. Signals are applied after the lookup
+        # because they can change between calls.
+        self.rendered: "OrderedDict[Tuple[str, tuple], str]" = OrderedDict()
+        self.cache_size = cache_size
+        self.max_chars = max_chars
+        self.cached_chars = 0
     
     def render_template(self, template: str, variables: Dict[str, Any]) -> str:
         """Render a template with variables"""
+        names = _placeholder_names(template)
+        if names is None:
+            result = self.substitute_variables(template, variables)
+        else:
+            # Only variables the template names can affect the result, so
+            # unused ones (such as a large resolved_context) stay out of the key
+            key = (template, tuple(
+                (name, _freeze(value)) for name, value in variables.items()
+                if name in names or '{' in name or '}' in name
+            ))
+            result = self.rendered.get(key)
+            if result is None:
+                result, exact = self._substitute(template, variables)
+                if exact:
+                    self._remember(key, result)
+            else:
+                self.rendered.move_to_end(key)
+        
+        # Handle signals
+        if '{{signal.' in result:
+            for signal_match in _SIGNAL_RE.finditer(result):
+                signal_name = signal_match.group(1)
+                signal_value = self.context.get_signal(signal_name)
+                if signal_value:
+                    result = result.replace(signal_match.group(0), str(signal_value))
+        
+        return result
+    
+    def _remember(self, key: Tuple[str, tuple], result: str):
+        size = len(key[0]) + len(result)
+        if size > self.max_chars:
+            return
+        self.rendered[key] = result
+        self.cached_chars += size
+        
+        # Drop least recently used entries over the limits
+        rendered = self.rendered
+        while len(rendered) > self.cache_size or self.cached_chars > self.max_chars:
+            old_key, old_result = rendered.popitem(last=False)
+            self.cached_chars -= len(old_key[0]) + len(old_result)
+    
+    def substitute_variables(self, template: str, variables: Dict[str, Any]) -> str:
+        """Replace {{key}} placeholders and list filters with variable values"""
+        return self._substitute(template, variables)[0]
+    
+    def _substitute(self, template: str, variables: Dict[str, Any]) -> Tuple[str, bool]:
+        """Substitute variables; the flag says whether only the template's own
+        placeholder names decided which variables were used
+        """
         result = template
         
+        # Placeholder names come from one cached scan of the template, so a
+        # variable is checked with a set lookup instead of a scan of the
+        # result. That only holds while substituted text cannot form new
+        # placeholders; once it contains a brace, fall back to scanning.
+        names = _placeholder_names(template)
+        
         # Simple template rendering - in production, use Jinja2 or similar
         for key, value in variables.items():
             placeholder = f"{{{{{key}}}}}"
-            if placeholder in result:
+            if names is not None and '{' not in key and '}' not in key:
+                present = key in names
+            else:
+                present = placeholder in result
+            if present:
                 if isinstance(value, list):
                     # Handle list formatting
                     if '| bulletize' in result:
@@ -345,24 +712,25 @@ class PromptRenderer:
                         result = result.replace(f"{{{{{key} | bulletize}}}}", formatted)
                     elif '| join' in result:
                         # Extract separator
-                        match = re.search(rf"{{{{{key} \| join\('(.+?)'\)}}}}", result)
+                        match = _compile(rf"{{{{{key} \| join\('(.+?)'\)}}}}").search(result)
                         if match:
                             sep = match.group(1)
                             formatted = sep.join(str(item) for item in value)
                             result = result.replace(match.group(0), formatted)
+                            if '{' in sep or '}' in sep:
+                                names = None
+                        else:
+                            formatted = ''
                     else:
-                        result = result.replace(placeholder, str(value))
+                        formatted = str(value)
+                        result = result.replace(placeholder, formatted)
                 else:
-                    result = result.replace(placeholder, str(value))
-        
-        # Handle signals
-        for signal_match in re.finditer(r'{{signal\.(\w+)}}', result):
-            signal_name = signal_match.group(1)
-            signal_value = self.context.get_signal(signal_name)
-            if signal_value:
-                result = result.replace(signal_match.group(0), str(signal_value))
+                    formatted = str(value)
+                    result = result.replace(placeholder, formatted)
+                if names is not None and ('{' in formatted or '}' in formatted):
+                    names = None
         
-        return result
+        return result, names is not None
     
     def render_prompt(self, prompt_config: Dict[str, str], resolved_context: Dict[str, Any]) -> Dict[str, str]:
         """Render all prompt sections"""
@@ -382,6 +750,13 @@ class PromptRenderer:
         return rendered
 
 
+# (selector, result key, whether 'from' is a node reference, referenced node)
+_SelectorPlan = Tuple[Dict[str, Any], str, bool, Optional[Dict[str, Any]]]
+
+# (selector plans, role node, model node)
+_ViewPlan = Tuple[List[_SelectorPlan], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
 class Runtime:
     """Main CHORD runtime engine"""
     
@@ -394,6 +769,24 @@ class Runtime:
         self.selector_registry = SelectorRegistry()
         self.context_manager = ContextManager()
         self.prompt_renderer = PromptRenderer(self.context)
+        # Upper bound on selectors of one view resolved at the same time
+        self.max_selector_concurrency = 16
+        
+        # Lookup indexes; the first view or flow with a given id wins, as
+        # with the linear scans they replace
+        self._views_by_id: Dict[str, Dict[str, Any]] = {}
+        self._views_by_task: Dict[str, List[str]] = {}
+        for view in self.views:
+            self._views_by_id.setdefault(view['id'], view)
+            task = view.get('task')
+            if isinstance(task, str):
+                self._views_by_task.setdefault(task, []).append(view['id'])
+        self._flows_by_id: Dict[str, Dict[str, Any]] = {}
+        for flow in self.flows:
+            self._flows_by_id.setdefault(flow['id'], flow)
+        
+        # Per-view selector plans and role/model nodes, built on first execution
+        self._compiled_views: Dict[str, _ViewPlan] = {}
     
     def set_signal(self, name: str, value: Any):
         """Set a signal value"""
@@ -403,87 +796,113 @@ class Runtime:
         """Set multiple signals"""
         self.context.signals.update(signals)
     
+    def _plan_selector(self, selector: Dict[str, Any]) -> _SelectorPlan:
+        """Parse a selector's source reference and result key once"""
+        from_ref = selector.get('from', '')
+        if from_ref.startswith('@'):
+            node_id = _parse_ref(from_ref)[0]
+            return selector, node_id, True, self.nodes.get(node_id)
+        return selector, 'data', False, None
+    
+    def _awaits_io(self, plan: _SelectorPlan) -> bool:
+        """Whether a selector fetches context or uses an async operation"""
+        selector, _, is_ref, node = plan
+        if is_ref and node is not None and node.get('type') == 'ctx':
+            return True
+        return isinstance(self.selector_registry.get(selector.get('op', 'extract')), AsyncSelectorOperation)
+    
     async def execute_selector(self, selector: Dict[str, Any]) -> Any:
         """Execute a single selector"""
-        from_ref = selector.get('from', '')
+        return await self._execute_planned(*self._plan_selector(selector))
+    
+    async def _execute_planned(self, selector: Dict[str, Any], key: str, is_ref: bool, node: Optional[Dict[str, Any]]) -> Any:
+        """Execute a selector whose source has already been resolved"""
         op = selector.get('op', 'extract')
         
         # Resolve the source
-        if from_ref.startswith('@'):
-            node_id = from_ref[1:].split('.')[0]
-            if node_id in self.nodes:
-                node = self.nodes[node_id]
-                if node['type'] == 'ctx':
-                    # Fetch context
-                    data = await self.context_manager.fetch_context(node)
-                else:
-                    data = node.get('properties', {})
+        if is_ref:
+            if node is None:
+                raise ValueError(f"Unknown node: {selector.get('from', '')}")
+            if node['type'] == 'ctx':
+                # Fetch context
+                data = await self.context_manager.fetch_context(node)
             else:
-                raise ValueError(f"Unknown node: {from_ref}")
+                data = node.get('properties', {})
         else:
-            data = from_ref
+            data = selector.get('from', '')
         
         # Apply operation
         operation = self.selector_registry.get(op)
+        if isinstance(data, bytes) and not getattr(operation, 'accepts_bytes', False):
+            data = data.decode('utf-8', 'replace')
         if operation:
-            return await operation.execute(data, selector)
+            # Only async operations (or legacy ones with a coroutine
+            # execute) hand back something to await
+            result = operation.execute(data, selector)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
         else:
             logger.warning(f"Unknown selector operation: {op}")
             return data
     
     async def resolve_selectors(self, selectors: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Resolve all selectors for a view"""
-        resolved = {}
+        return await self._resolve_planned([self._plan_selector(selector) for selector in selectors])
+    
+    async def _resolve_planned(self, plans: List[_SelectorPlan]) -> Dict[str, Any]:
+        """Resolve pre-planned selectors concurrently"""
+        if not any(map(self._awaits_io, plans)):
+            # Nothing to overlap: run inline rather than paying for a task per selector
+            results = []
+            for plan in plans:
+                try:
+                    results.append(await self._execute_planned(*plan))
+                except Exception as e:
+                    results.append(e)
+        else:
+            semaphore = asyncio.Semaphore(self.max_selector_concurrency)
+            
+            async def run(plan: _SelectorPlan) -> Any:
+                async with semaphore:
+                    return await self._execute_planned(*plan)
+            
+            # Selectors are independent, so their context fetches overlap
+            results = await asyncio.gather(*(run(plan) for plan in plans), return_exceptions=True)
         
-        for selector in selectors:
-            from_ref = selector.get('from', '')
-            # Extract node ID for result key
-            if from_ref.startswith('@'):
-                key = from_ref[1:].split('.')[0]
+        resolved = {}
+        for (selector, key, _, _), result in zip(plans, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error executing selector {selector}: {result}")
+                resolved[key] = f"[Error: {result}]"
+            elif isinstance(result, BaseException):
+                raise result
+            elif isinstance(result, bytes):
+                # Binary context stays undecoded through the selector
+                resolved[key] = result.decode('utf-8', 'replace')
             else:
-                key = 'data'
-            
-            try:
-                result = await self.execute_selector(selector)
                 resolved[key] = result
-            except Exception as e:
-                logger.error(f"Error executing selector {selector}: {e}")
-                resolved[key] = f"[Error: {e}]"
         
         return resolved
     
     async def execute_view(self, view_id: str) -> Dict[str, Any]:
         """Execute a view and generate prompt"""
         # Find view
-        view = None
-        for v in self.views:
-            if v['id'] == view_id:
-                view = v
-                break
-        
+        view = self._views_by_id.get(view_id)
         if not view:
             raise ValueError(f"View not found: {view_id}")
         
+        compiled = self._compiled_views.get(view_id)
+        if compiled is None:
+            compiled = self._compiled_views[view_id] = self._compile_view(view)
+        plans, role_node, model_node = compiled
+        
         # Resolve selectors
-        selectors = view.get('selectors', [])
-        resolved_context = await self.resolve_selectors(selectors)
+        resolved_context = await self._resolve_planned(plans)
         
         # Get role and model info
-        role_id = view.get('role', '')
-        model_id = view.get('model', '')
-        
-        role = None
-        model = None
-        
-        if role_id and role_id.startswith('@'):
-            role_node_id = role_id[1:]
-            if role_node_id in self.nodes:
-                role = self.nodes[role_node_id]['properties']
-        
-        if model_id and model_id.startswith('@'):
-            model_node_id = model_id[1:]
-            if model_node_id in self.nodes:
-                model = self.nodes[model_node_id]['properties']
+        role = role_node['properties'] if role_node is not None else None
+        model = model_node['properties'] if model_node is not None else None
         
         # Render prompt
         prompt_config = view.get('prompt', {})
@@ -503,6 +922,24 @@ class Runtime:
         
         return result
     
+    def _compile_view(self, view: Dict[str, Any]) -> _ViewPlan:
+        """Pre-resolve a view's selector sources and role/model nodes"""
+        plans = [self._plan_selector(selector) for selector in view.get('selectors', [])]
+        
+        role_id = view.get('role', '')
+        model_id = view.get('model', '')
+        
+        role_node = None
+        model_node = None
+        
+        if role_id and role_id.startswith('@'):
+            role_node = self.nodes.get(role_id[1:])
+        
+        if model_id and model_id.startswith('@'):
+            model_node = self.nodes.get(model_id[1:])
+        
+        return plans, role_node, model_node
+    
     async def execute_task(self, task_id: str) -> Dict[str, Any]:
         """Execute a task"""
         if task_id not in self.nodes:
@@ -513,10 +950,7 @@ class Runtime:
             raise ValueError(f"Node {task_id} is not a task")
         
         # Find views that reference this task
-        task_views = []
-        for view in self.views:
-            if view.get('task') == f"@{task_id}":
-                task_views.append(view['id'])
+        task_views = self._views_by_task.get(f"@{task_id}")
         
         if not task_views:
             logger.warning(f"No views found for task {task_id}")
@@ -533,12 +967,7 @@ class Runtime:
     
     async def execute_flow(self, flow_id: str) -> Dict[str, Any]:
         """Execute a flow"""
-        flow = None
-        for f in self.flows:
-            if f['id'] == flow_id:
-                flow = f
-                break
-        
+        flow = self._flows_by_id.get(flow_id)
         if not flow:
             raise ValueError(f"Flow not found: {flow_id}")
         
@@ -548,7 +977,7 @@ class Runtime:
         if 'entry' in flow:
             entry_task = flow['entry']
             if entry_task.startswith('@'):
-                task_id = entry_task[1:].split('.')[0]
+                task_id = _parse_ref(entry_task)[0]
                 result = await self.execute_task(task_id)
                 results.append(result)
         
@@ -558,7 +987,7 @@ class Runtime:
             to_task = edge.get('to', '')
             
             if to_task and to_task.startswith('@'):
-                task_id = to_task[1:].split('.')[0]
+                task_id = _parse_ref(to_task)[0]
                 result = await self.execute_task(task_id)
                 results.append(result)
         
@@ -576,8 +1005,9 @@ async def execute_ir(ir: Dict[str, Any], signals: Dict[str, Any] = None) -> Dict
         runtime.set_signals(signals)
     
     # Default signals
-    runtime.set_signal('date', datetime.now().strftime('%Y-%m-%d'))
-    runtime.set_signal('timestamp', datetime.now().isoformat())
+    now = datetime.now()
+    runtime.set_signal('date', now.strftime('%Y-%m-%d'))
+    runtime.set_signal('timestamp', now.isoformat())
     
     # Find and execute default view or flow
     if runtime.views:
@@ -595,6 +1025,10 @@ def main():
     import sys
     import argparse
     
+    # Configured here rather than at import so embedding applications and
+    # the chord CLI keep control of logging
+    logging.basicConfig(level=logging.INFO)
+    
     parser = argparse.ArgumentParser(description="CHORD Runtime")
     parser.add_argument("ir_file", help="Path to compiled .chordi file")
     parser.add_argument("--view", help="View ID to execute")
@@ -638,14 +1072,16 @@ def main():
         result = asyncio.run(run())
         
         # Output
-        output_json = json.dumps(result, indent=2, default=str)
+        output_json = _dumps(result, default=str)
         
         if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
+            with open(args.output, 'wb') as f:
                 f.write(output_json)
             print(f"✓ Output written to {args.output}")
         else:
-            print(output_json)
+            # Separate writes so the encoded result is never copied
+            sys.stdout.buffer.write(output_json)
+            sys.stdout.buffer.write(b"\n")
     
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,102 @@
+"""Tests for the CHORD CLI helpers"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import chord_cli
+from chord_cli import _fast_dumps, _fast_dumps_compact
+
+
+def test_fast_dumps_handle_wide_integers():
+    obj = {'limit': 123456789012345678901234567890, 'name': 'é'}
+    
+    assert json.loads(_fast_dumps(obj)) == obj
+    assert json.loads(_fast_dumps_compact(obj)) == obj
+
+
+def test_cache_home_ignores_empty_and_relative_values(monkeypatch):
+    for value in ('', 'relative/cache'):
+        monkeypatch.setenv('XDG_CACHE_HOME', value)
+        assert chord_cli._cache_home() == Path.home() / '.cache'
+    
+    monkeypatch.setenv('XDG_CACHE_HOME', '/var/cache/chord-test')
+    assert chord_cli._cache_home() == Path('/var/cache/chord-test')
+
+
+def test_ir_cache_is_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(chord_cli, 'IR_CACHE_DIR', tmp_path / 'ir')
+    monkeypatch.setattr(chord_cli, 'IR_CACHE_MAX_ENTRIES', 3)
+    
+    for i in range(6):
+        source = tmp_path / f"s{i}.chord"
+        source.write_text(f'def task t{i} {{ objective: "x" }}\n')
+        ir = chord_cli._load_or_compile(source)
+        assert list(ir['nodes']) == [f"t{i}"]
+        # Cache hits return the same IR
+        assert chord_cli._load_or_compile(source) == ir
+    
+    assert len(list((tmp_path / 'ir').glob('*.json'))) == 3
+
+
+def test_invalid_log_level_falls_back_to_warning(monkeypatch):
+    monkeypatch.setenv('CHORD_LOG', 'verbose')
+    monkeypatch.setattr(chord_cli, '_log_configured', False)
+    root = logging.getLogger()
+    monkeypatch.setattr(root, 'handlers', [])
+    monkeypatch.setattr(root, 'level', root.level)
+    
+    chord_cli._configure_logging()
+    
+    assert root.level == logging.WARNING
+
+
+def test_compile_compact_matches_pretty_with_overflowing_floats(tmp_path, capsys):
+    # A long enough decimal literal overflows to inf
+    digits = "1" + "0" * 400 + ".5"
+    source = tmp_path / 'big.chord'
+    source.write_text(f"def task t {{\n  big: {digits}\n  items: [{digits}, null]\n}}\n")
+    
+    outputs = []
+    for pretty in (False, True):
+        output = tmp_path / f"big-{pretty}.chordi"
+        chord_cli.cmd_compile(argparse.Namespace(file=str(source), output=str(output), pretty=pretty))
+        outputs.append(json.loads(output.read_text(encoding='utf-8')))
+    
+    assert outputs[0] == outputs[1]
+    assert outputs[0]['nodes']['t']['properties'] == {'big': float('inf'), 'items': [float('inf'), None]}
+    assert json.loads(_fast_dumps({'x': float('inf')}))['x'] == float('inf')
+    assert json.loads(_fast_dumps_compact([float('inf'), None])) == [float('inf'), None]
+
+
+def test_ir_cache_hit_survives_utime_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(chord_cli, 'IR_CACHE_DIR', tmp_path / 'ir')
+    source = tmp_path / 's.chord'
+    source.write_text('def task t { objective: "x" }\n')
+    ir = chord_cli._load_or_compile(source)
+    
+    def fail_utime(*args, **kwargs):
+        raise PermissionError('read-only cache')
+    
+    def fail_compile(*args, **kwargs):
+        raise AssertionError('cache hit expected')
+    
+    monkeypatch.setattr(chord_cli.os, 'utime', fail_utime)
+    monkeypatch.setattr('chord_compiler.compile_chord', fail_compile)
+    
+    assert chord_cli._load_or_compile(source) == ir
+
+
+def test_chord_log_applies_after_importing_the_runtime():
+    # Importing the runtime must leave logging unconfigured for the CLI
+    code = ("import logging, chord_runtime, chord_cli; "
+            "assert not logging.getLogger().handlers; "
+            "chord_cli._configure_logging(); print(logging.getLogger().level)")
+    result = subprocess.run([sys.executable, '-c', code], cwd=Path(chord_cli.__file__).parent,
+                            env={**os.environ, 'CHORD_LOG': 'debug'}, capture_output=True, text=True, check=True)
+    
+    assert result.stdout.strip() == str(logging.DEBUG)
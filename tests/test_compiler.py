@@ -0,0 +1,123 @@
+"""Tests for the CHORD compiler"""
+
+import json
+
+import pytest
+
+from chord_compiler import Lexer, Token, TokenType, _dumps, compile_chord
+
+
+def test_list_entries_keep_nested_references_unresolved():
+    # Only a list's own string entries are resolved, so an edge pointing at
+    # a task that does not exist yet still compiles
+    ir = compile_chord("""
+def task a { objective: "x" }
+def flow f {
+  entry: @a
+  edges: [{ from: @a, to: @missing }]
+  tags: [@a.objective, "b"]
+}
+""")
+    
+    flow = ir["nodes"]["f"]["properties"]
+    assert flow["edges"] == [{"from": "@a", "to": "@missing"}]
+    assert flow["tags"] == ["x", "b"]
+
+
+def test_view_and_flow_keep_node_pointers():
+    ir = compile_chord("""
+def role reviewer { cfg: { strict: true } }
+def task review { objective: "review" }
+def view main {
+  task: @review
+  role: @reviewer.cfg
+  selectors: [{ from: @reviewer.cfg, op: "transform" }]
+}
+def flow pipeline { entry: @review }
+""")
+    
+    view = ir["views"][0]
+    assert view["task"] == "@review"
+    assert view["role"] == "@reviewer.cfg"
+    assert view["selectors"] == [{"from": {"strict": True}, "op": "transform"}]
+    assert ir["flows"][0]["entry"] == "@review"
+
+
+def test_dumps_handles_wide_integers():
+    ir = compile_chord("def task t { limit: 123456789012345678901234567890 }")
+    
+    assert json.loads(_dumps(ir)) == ir
+    assert json.loads(_dumps(ir, pretty=True)) == ir
+
+
+def test_dumps_keeps_overflowing_floats():
+    # No exponent syntax; a long enough decimal literal overflows to inf
+    digits = "1" + "0" * 400 + ".5"
+    ir = compile_chord(f"def task t {{\n  big: {digits}\n  items: [{digits}, null]\n}}")
+    
+    for pretty in (False, True):
+        output = _dumps(ir, pretty)
+        assert b"Infinity" in output
+        assert json.loads(output)["nodes"]["t"]["properties"] == {"big": float("inf"), "items": [float("inf"), None]}
+
+
+def test_token_from_raw_wraps_lexer_tuples():
+    tokens = [Token.from_raw(raw) for raw in Lexer("def task t { n: 1 }").tokenize()]
+    
+    assert [(t.type, t.value) for t in tokens] == [
+        (TokenType.DEF, "def"), (TokenType.IDENTIFIER, "task"), (TokenType.IDENTIFIER, "t"),
+        (TokenType.LBRACE, "{"), (TokenType.IDENTIFIER, "n"), (TokenType.COLON, ":"),
+        (TokenType.NUMBER, 1), (TokenType.RBRACE, "}"), (TokenType.EOF, None),
+    ]
+    assert (tokens[2].line, tokens[2].column) == (1, 10)
+
+
+def _tokens(source):
+    return [(Token.from_raw(raw).type, raw[1], raw[2], raw[3]) for raw in Lexer(source).tokenize()]
+
+
+def test_lexer_string_escapes_in_both_quote_styles():
+    assert _tokens('a: "x\\"y\\n\\t\\\\z"')[2] == (TokenType.STRING, 'x"y\n\t\\z', 1, 4)
+    assert _tokens("a: 'it\\'s \"q\"' b")[2:] == [
+        (TokenType.STRING, 'it\'s "q"', 1, 4), (TokenType.IDENTIFIER, 'b', 1, 16), (TokenType.EOF, None, 1, 17),
+    ]
+
+
+def test_lexer_unterminated_string_runs_to_end_of_input():
+    assert _tokens("a: 'open\n  more")[2:] == [(TokenType.STRING, 'open\n  more', 1, 4), (TokenType.EOF, None, 2, 8)]
+    
+    with pytest.raises(SyntaxError, match="Expected TokenType.RBRACE, got TokenType.EOF at line 4"):
+        compile_chord("def task t {\n  a: 'x\n}\n")
+
+
+def test_lexer_nested_dynamic_references():
+    assert _tokens('a: @{a{b}c} @{a{b{c}}d} @x.y[0]')[2:] == [
+        (TokenType.REFERENCE, '{a{b}c}', 1, 4),
+        (TokenType.REFERENCE, '{a{b{c}}d}', 1, 13),
+        (TokenType.REFERENCE, 'x.y[0]', 1, 25),
+        (TokenType.EOF, None, 1, 32),
+    ]
+
+
+def test_lexer_block_comments():
+    assert _tokens('a #[ block\n comment ]# b') == [
+        (TokenType.IDENTIFIER, 'a', 1, 1), (TokenType.IDENTIFIER, 'b', 2, 13), (TokenType.EOF, None, 2, 14),
+    ]
+    # An unterminated block comment runs to end of input
+    assert _tokens('#[ open\n x') == [(TokenType.EOF, None, 2, 3)]
+
+
+def test_lexer_multiline_block_dedents():
+    assert _tokens('a: |\n    line1\n      indented\n    line3\nb: 1')[2:] == [
+        (TokenType.STRING, 'line1\nindented\nline3', 1, 4),
+        (TokenType.IDENTIFIER, 'b', 5, 1), (TokenType.COLON, ':', 5, 2), (TokenType.NUMBER, 1, 5, 4),
+        (TokenType.EOF, None, 5, 5),
+    ]
+
+
+def test_lexer_crlf_input():
+    tokens = _tokens('def task t {\r\n  a: "x"\r\n  b: |\r\n    hi\r\n}\r\n')
+    
+    # '\r' is whitespace outside multi-line blocks, which keep it
+    assert [(t, v) for t, v, _, _ in tokens if t is TokenType.STRING] == [(TokenType.STRING, 'x'), (TokenType.STRING, 'hi\r')]
+    assert tokens[-3:] == [(TokenType.RBRACE, '}', 5, 1), (TokenType.NEWLINE, '\n', 5, 3), (TokenType.EOF, None, 6, 1)]
@@ -0,0 +1,189 @@
+"""Tests for the CHORD runtime"""
+
+import asyncio
+import json
+import os
+from pathlib import Path, PurePath
+
+import pytest
+
+from chord_compiler import compile_chord
+from chord_runtime import (ContextManager, ExecutionContext, ExtractSelector, HeadSelector, PromptRenderer, Runtime,
+                           TailSelector, TransformSelector, _path_matcher)
+
+
+def test_render_cache_ignores_unused_variables():
+    renderer = PromptRenderer(ExecutionContext())
+    template = "Do {{task}}"
+    
+    assert renderer.render_template(template, {'task': 'a', 'resolved_context': {'f': 'x'}}) == "Do a"
+    assert renderer.render_template(template, {'task': 'a', 'resolved_context': {'f': 'y'}}) == "Do a"
+    assert renderer.render_template(template, {'task': 'b', 'resolved_context': {'f': 'y'}}) == "Do b"
+    
+    # Unused variables are not part of the cache key
+    assert len(renderer.rendered) == 2
+    assert all('resolved_context' not in dict(key[1]) for key in renderer.rendered)
+
+
+def test_render_cache_skips_substitutions_that_form_placeholders():
+    renderer = PromptRenderer(ExecutionContext())
+    template = "{{a}}"
+    
+    # a's value introduces {{b}}, so b decides the result despite not being named
+    assert renderer.render_template(template, {'a': '{{b}}', 'b': '1'}) == "1"
+    assert renderer.render_template(template, {'a': '{{b}}', 'b': '2'}) == "2"
+
+
+def test_render_cache_bounded_by_size():
+    renderer = PromptRenderer(ExecutionContext(), max_chars=100)
+    
+    for i in range(20):
+        renderer.render_template("{{x}}", {'x': str(i) * 10})
+    assert renderer.render_template("{{x}}", {'x': 'y' * 200}) == 'y' * 200
+    
+    assert renderer.cached_chars <= 100
+    assert renderer.cached_chars == sum(len(key[0]) + len(value) for key, value in renderer.rendered.items())
+
+
+def test_view_with_property_role_reference_runs():
+    ir = compile_chord("""
+def role reviewer { cfg: { strict: true } }
+def view main { role: @reviewer.cfg }
+""")
+    
+    result = asyncio.run(Runtime(ir).execute_view('main'))
+    
+    # '@reviewer.cfg' does not name a node, so no role is attached
+    assert result['role'] is None
+
+
+def test_transform_pretty_prints_json_orjson_rejects():
+    transform = TransformSelector()
+    
+    assert transform.execute('{"a": NaN, "b": [Infinity]}', {}) == '{\n  "a": NaN,\n  "b": [\n    Infinity\n  ]\n}'
+    assert transform.execute('{"n": 123456789012345678901234567890}', {}) == '{\n  "n": 123456789012345678901234567890\n}'
+    assert transform.execute('[1e400]', {}) == '[\n  Infinity\n]'
+    assert transform.execute('not json', {}) == 'not json'
+
+
+def test_transform_keeps_non_finite_floats_in_dicts():
+    transform = TransformSelector()
+    data = {'big': float('inf'), 'small': float('-inf'), 'nested': [float('nan'), None]}
+    
+    assert transform.execute(data, {}) == json.dumps(data, indent=2)
+
+
+def _fetch(manager, path):
+    return asyncio.run(manager.fetch_context({'properties': {'type': 'file', 'uri': str(path)}}))
+
+
+def test_context_cache_shares_identical_content(tmp_path):
+    manager = ContextManager(maxsize=2)
+    a, b, c = (tmp_path / name for name in 'abc')
+    a.write_text('same')
+    b.write_text('same')
+    c.write_text('other')
+    
+    assert _fetch(manager, a) is _fetch(manager, b)
+    assert len(manager.cache) == 2
+    assert len(manager.blobs) == 1
+    assert manager.cached_bytes == len('same')
+    
+    # Evicting a keeps the content alive for b
+    _fetch(manager, c)
+    assert list(manager.cache) == [f"file:{b}", f"file:{c}"]
+    assert len(manager.blobs) == 2
+    assert manager.blobs[manager.cache[f"file:{b}"][1]][2] == 1
+    assert _fetch(manager, b) == 'same'
+
+
+def test_context_cache_refetches_on_mtime_change(tmp_path):
+    manager = ContextManager()
+    path = tmp_path / 'a'
+    path.write_text('old')
+    assert _fetch(manager, path) == 'old'
+    
+    # Same size, so only the new mtime reveals the edit
+    path.write_text('new')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _fetch(manager, path) == 'new'
+    assert len(manager.cache) == 1
+    assert len(manager.blobs) == 1
+    assert manager.cached_bytes == len('new')
+
+
+def test_context_cache_evicts_least_recently_used(tmp_path):
+    manager = ContextManager(maxsize=3)
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"f{i}"
+        path.write_text(str(i))
+        paths.append(path)
+    
+    for path in paths[:3]:
+        _fetch(manager, path)
+    # A hit makes f0 the most recently used, so f1 goes first
+    _fetch(manager, paths[0])
+    _fetch(manager, paths[3])
+    
+    assert list(manager.cache) == [f"file:{paths[i]}" for i in (2, 0, 3)]
+    assert manager.cached_bytes == 3
+
+
+_MATCH_PATHS = [
+    'a.py', 'src/a.py', '/src/a.py', 'src/pkg/a.py', 'src/.env', '.git/config',
+    'node_modules/x/index.js', 'a/b/c', '/a/b', 'docs/README.md',
+]
+
+
+@pytest.mark.parametrize('pattern', [
+    '*.py', 'a.py', '.*', '*', '**', '**/*.py', 'src/*.py', 'src/**/*.py',
+    'pkg/*', 'x/*.js', '/src/*.py', '/a/b', '/*', '.git/*', 'a/b/c', '[ab].py', '?.py',
+])
+def test_path_matcher_agrees_with_purepath_match(pattern):
+    for combo in ([pattern], [pattern, '*.md']):
+        matches = _path_matcher(combo)
+        for path in _MATCH_PATHS:
+            expected = any(PurePath(path).match(p) for p in combo)
+            assert matches(Path(path)) == expected, (combo, path)
+
+
+_LINE_TEXTS = [
+    '', '\n', 'one', 'one\n', 'a\nb\nc', 'a\nb\nc\n', 'a\n\nb\n\n',
+    'a\r\nb\r\nc\r\n', 'a\rb\rc', 'a\x0bb\nc', 'a\nb\x0b', 'a\nb\r\n',
+]
+
+
+@pytest.mark.parametrize('text', _LINE_TEXTS + [t.encode() for t in _LINE_TEXTS])
+@pytest.mark.parametrize('lines', [-1, 0, 1, 2, 3, 10])
+def test_head_and_tail_agree_with_splitlines(text, lines):
+    newline = '\n' if isinstance(text, str) else b'\n'
+    
+    assert HeadSelector().execute(text, {'lines': lines}) == newline.join(text.splitlines()[:lines])
+    assert TailSelector().execute(text, {'lines': lines}) == newline.join(text.splitlines()[-lines:])
+
+
+def _extract_sections_by_lines(text, sections):
+    # The line-by-line loop the sliced fast path must agree with
+    extracted = []
+    current = None
+    for line in text.splitlines():
+        if line.startswith('#'):
+            if current and any(s in current[0] for s in sections):
+                extracted.append('\n'.join(current))
+            current = [line]
+        elif current is not None:
+            current.append(line)
+    if current and any(s in current[0] for s in sections):
+        extracted.append('\n'.join(current))
+    return '\n\n'.join(extracted)
+
+
+@pytest.mark.parametrize('text', [
+    '', 'intro\n', '# A\nx\n# B\ny\n', 'intro\n# A\nx\n\n## A2\nz', '# A\n# B\n# A\n',
+    '# A\nx\n\n\n', '#\n# B\ny', '# A\r\nx\r\n# B\r\ny', '# A\nx\x0by\n# B\n',
+])
+@pytest.mark.parametrize('sections', [['A'], ['B'], ['A', 'B'], ['missing'], ['']])
+def test_extract_sections_agree_with_line_loop(text, sections):
+    assert ExtractSelector().execute(text, {'sections': sections}) == _extract_sections_by_lines(text, sections)